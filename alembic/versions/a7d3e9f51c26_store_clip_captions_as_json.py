@@ -0,0 +1,45 @@
+"""Store clip captions as JSON
+
+Revision ID: a7d3e9f51c26
+Revises: f3a9d6c48e12
+Create Date: 2026-08-29 16:21:08.447512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e9f51c26'
+down_revision: Union[str, Sequence[str], None] = 'f3a9d6c48e12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Captions move from a JSON-text blob to a real JSON column so the
+    # driver handles (de)serialization instead of per-clip json.loads.
+    # Batch mode keeps SQLite happy (table recreate); on Postgres the
+    # USING clause casts the existing text in place.
+    with op.batch_alter_table('clips') as batch_op:
+        batch_op.alter_column(
+            'transcription',
+            existing_type=sa.Text(),
+            type_=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using='transcription::json',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('clips') as batch_op:
+        batch_op.alter_column(
+            'transcription',
+            existing_type=sa.JSON(),
+            type_=sa.Text(),
+            existing_nullable=True,
+        )
@@ -0,0 +1,48 @@
+"""Add pipeline step results table
+
+Revision ID: b5e8c2a94f17
+Revises: a7d3e9f51c26
+Create Date: 2026-08-29 17:02:53.916284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8c2a94f17'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e9f51c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Step payloads move out of the content_assets.pipeline_data blob into
+    # one row per (asset, step), so each step commit rewrites only its own
+    # data. Existing blobs stay in place as the read fallback.
+    op.create_table(
+        'pipeline_step_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('asset_id', sa.Integer(), nullable=True),
+        sa.Column('step', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['asset_id'], ['content_assets.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_pipeline_step_results_id'), 'pipeline_step_results', ['id'], unique=False)
+    op.create_index(op.f('ix_pipeline_step_results_created_at'), 'pipeline_step_results', ['created_at'], unique=False)
+    op.create_index('ix_step_results_asset_step', 'pipeline_step_results', ['asset_id', 'step'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_step_results_asset_step', table_name='pipeline_step_results')
+    op.drop_index(op.f('ix_pipeline_step_results_created_at'), table_name='pipeline_step_results')
+    op.drop_index(op.f('ix_pipeline_step_results_id'), table_name='pipeline_step_results')
+    op.drop_table('pipeline_step_results')
@@ -0,0 +1,30 @@
+"""Add google sync fields to event
+
+Revision ID: d41e77b20c13
+Revises: c94a64ac5ad5
+Create Date: 2026-08-29 10:02:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41e77b20c13'
+down_revision: Union[str, Sequence[str], None] = 'c94a64ac5ad5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('events', sa.Column('google_event_id', sa.String(), nullable=True))
+    op.add_column('events', sa.Column('sync_state', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('events', 'sync_state')
+    op.drop_column('events', 'google_event_id')
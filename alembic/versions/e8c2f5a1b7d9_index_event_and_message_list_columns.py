@@ -0,0 +1,34 @@
+"""Index event and message list columns
+
+Revision ID: e8c2f5a1b7d9
+Revises: d41e77b20c13
+Create Date: 2026-08-29 14:37:12.552981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c2f5a1b7d9'
+down_revision: Union[str, Sequence[str], None] = 'd41e77b20c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_events orders by start_time and the chat tools page messages by
+    # timestamp; indexed, both become index range scans instead of sorts.
+    op.create_index(op.f('ix_events_start_time'), 'events', ['start_time'], unique=False)
+    op.create_index(op.f('ix_events_end_time'), 'events', ['end_time'], unique=False)
+    op.create_index(op.f('ix_whatsapp_messages_timestamp'), 'whatsapp_messages', ['timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_whatsapp_messages_timestamp'), table_name='whatsapp_messages')
+    op.drop_index(op.f('ix_events_end_time'), table_name='events')
+    op.drop_index(op.f('ix_events_start_time'), table_name='events')
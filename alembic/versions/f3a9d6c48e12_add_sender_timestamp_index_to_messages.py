@@ -0,0 +1,29 @@
+"""Add sender+timestamp index to messages
+
+Revision ID: f3a9d6c48e12
+Revises: e8c2f5a1b7d9
+Create Date: 2026-08-29 15:04:27.803356
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d6c48e12'
+down_revision: Union[str, Sequence[str], None] = 'e8c2f5a1b7d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves the per-sender chat-history lookup as a single index seek
+    op.create_index('ix_wa_sender_ts', 'whatsapp_messages', ['sender', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_wa_sender_ts', table_name='whatsapp_messages')
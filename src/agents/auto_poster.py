@@ -1,16 +1,101 @@
 import os
 import json
 import time
+from collections import OrderedDict
+import random
+import shutil
+import hashlib
 import logging
 import requests
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from src.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _TokenBucket:
+    """Thread-safe token bucket: refills at `rate` tokens/sec up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _SizedStream:
+    """File-like wrapper that gives a urllib3 body a known length.
+
+    requests cannot size a raw urllib3 response (super_len fails on it),
+    so it would add Transfer-Encoding: chunked on top of an explicit
+    Content-Length and the upload endpoint rejects the mismatched
+    framing. Exposing the source's Content-Length via a `len` attribute
+    lets requests emit a plain sized body instead.
+    """
+
+    def __init__(self, raw, length: int):
+        self._raw = raw
+        self.len = length
+
+    def read(self, amt=None):
+        return self._raw.read(amt)
+
+
 class AutoPoster:
     """Auto-posting agent for GOGA BHAI. Handles posting clips to Instagram Reels and YouTube Shorts."""
 
+    # Outbound rate limits, shared by every AutoPoster instance and all worker
+    # threads — smoothing our own call rate keeps us under platform quotas
+    # instead of provoking 429s and the retry storms that follow.
+    GRAPH_BUCKET = _TokenBucket(rate=2.0, capacity=10)
+    YOUTUBE_BUCKET = _TokenBucket(rate=2.0, capacity=10)
+
+    # Cached YouTube access token — tokens live ~1h, so refreshing on every
+    # upload wastes a round-trip to oauth2.googleapis.com. Class-level so the
+    # cache survives even if a caller bypasses get_auto_poster() and builds
+    # its own instance (same refresh token either way).
+    _yt_token = ""
+    _yt_token_expires_at = 0.0
+    _yt_token_lock = threading.Lock()
+
+    # Shared Instagram poll board — concurrent Reels uploads register their
+    # container IDs here and one ?ids=... request status-checks all of them,
+    # so B parallel uploads cost ~1 status call per tick instead of B.
+    _IG_STATUS_TTL = 2.0
+    _ig_poll_lock = threading.Lock()
+    _ig_pending = {}
+    _ig_statuses = {}
+
+    # Hard ceiling for source downloads — Shorts/Reels clips are tens of MB,
+    # so anything bigger is a bad URL or abuse and shouldn't hit disk at all.
+    MAX_DOWNLOAD_BYTES = 512 * 1024 * 1024
+
+    # Platform upload ceilings, checked via a cheap HEAD probe before any
+    # bytes move (Instagram Reels 4GB; YouTube 256GB)
+    IG_MAX_BYTES = 4 * 1024 ** 3
+    YOUTUBE_MAX_BYTES = 256 * 1024 ** 3
+
+    # ETag-keyed download cache — the same clip URL is often downloaded more
+    # than once (retries, multi-platform posts), so revalidate with
+    # If-None-Match instead of re-pulling the full video.
+    DOWNLOAD_CACHE_DIR = os.path.join(tempfile.gettempdir(), "biru_bhai_dl_cache")
+
     def __init__(self):
         """Initialize with settings from src.config."""
         self.instagram_access_token = settings.instagram_access_token
@@ -25,6 +110,33 @@ class AutoPoster:
         self.youtube_refresh_token = settings.youtube_refresh_token
         self.request_timeout = 30
 
+        # One Session for all outbound calls: keep-alive + connection pooling
+        # saves a TCP/TLS handshake per request to the same host. Sessions are
+        # thread-safe, so the post_clip worker threads share it too.
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            # Transport-level retries for flaky platform edges; application
+            # code still handles the longer 429 waits itself. POST is
+            # deliberately excluded: a Graph publish that lands server-side
+            # but answers 5xx would be replayed into a duplicate public
+            # post, so POSTs rely on the app-level backoff. PUT is safe —
+            # it's only used for offset-checked resumable upload chunks.
+            max_retries=requests.adapters.Retry(
+                total=3, backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "PUT"],
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Compressed JSON from the Graph/YouTube APIs (explicit, though it's
+        # also the requests default). Binary video GETs override this with
+        # "identity" — compressing video wastes CPU and makes Content-Length
+        # disagree with the raw bytes we stream onward.
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+
         # Try to load credentials from dynamic login files
         self._load_dynamic_credentials()
 
@@ -32,8 +144,52 @@ class AutoPoster:
         if self.facebook_access_token and not self.facebook_page_id:
             self._discover_facebook_page()
 
+        # Static request payloads — credentials don't change after init, so
+        # build these once instead of on every call
+        self._yt_token_payload = {
+            "client_id": self.youtube_client_id,
+            "client_secret": self.youtube_client_secret,
+            "refresh_token": self.youtube_refresh_token,
+            "grant_type": "refresh_token"
+        }
+
+        # Precomputed Graph endpoints — account/page IDs are fixed once
+        # discovery has run, so build the URLs here instead of
+        # re-interpolating them on every call (and every poll iteration)
+        graph = "https://graph.facebook.com/v18.0"
+        self.ig_media_endpoint = f"{graph}/{self.instagram_user_id}/media"
+        self.ig_publish_endpoint = f"{graph}/{self.instagram_user_id}/media_publish"
+        self.fb_photos_endpoint = f"{graph}/{self.facebook_page_id}/photos"
+        self.fb_videos_endpoint = f"{graph}/{self.facebook_page_id}/videos"
+
+        # Per-URL HEAD probe results (size, content type) — see _probe_video
+        self._probe_cache = {}
+
+        # Idempotency cache: (video_url, platform) -> last POSTED result.
+        # A scheduler re-fire or retry with the same URL short-circuits here
+        # instead of re-running the whole upload/poll sequence.
+        self._posted_cache = OrderedDict()
+        self._posted_cache_lock = threading.Lock()
+
+        # Dispatch tables — the fan-out paths look platforms up here instead
+        # of walking an if/elif ladder, and adding a platform is one entry.
+        self._clip_dispatch = {
+            "INSTAGRAM": lambda url, caps, prev: self._post_instagram_clip(
+                url, caps['ig'], prev),
+            "YOUTUBE": lambda url, caps, prev: self.post_to_youtube_shorts(url, caps['yt'], caps['yt']),
+            "FACEBOOK": lambda url, caps, prev: self.post_to_facebook_video(url, caps['fb']),
+        }
+        self._image_dispatch = {
+            "INSTAGRAM": self.post_to_instagram_photo,
+            "FACEBOOK": self.post_to_facebook_photo,
+        }
+
         logger.info("AutoPoster initialized with configuration")
 
+    def close(self):
+        """Release pooled connections (mostly useful for short-lived scripts)."""
+        self.session.close()
+
     def _load_dynamic_credentials(self):
         """
         Check for facebook_token.json created by /auth/facebook/login.
@@ -53,7 +209,7 @@ class AutoPoster:
 
             # Fetch Pages and their IG Accounts
             url = f"https://graph.facebook.com/v18.0/me/accounts?fields=access_token,instagram_business_account,name,id&access_token={user_access_token}"
-            res = requests.get(url, timeout=10)
+            res = self.session.get(url, timeout=10)
             res.raise_for_status()
             pages_data = res.json().get("data", [])
             
@@ -92,7 +248,7 @@ class AutoPoster:
         """Auto-discover Facebook Page ID + IG Business Account from the Graph API token."""
         try:
             url = f"https://graph.facebook.com/v18.0/me/accounts?fields=access_token,instagram_business_account,name,id&access_token={self.facebook_access_token}"
-            res = requests.get(url, timeout=10)
+            res = self.session.get(url, timeout=10)
             res.raise_for_status()
             pages = res.json().get("data", [])
 
@@ -128,18 +284,20 @@ class AutoPoster:
         except Exception as e:
             logger.error(f"Facebook Page auto-discovery failed: {e}")
 
-    def post_to_instagram_reels(self, video_url: str, caption: str) -> dict:
+    def post_to_instagram_reels(self, video_url: str, caption: str, creation_id: str = None) -> dict:
         """
         Post a clip to Instagram Reels.
 
         Args:
             video_url: URL of the video to upload
             caption: Caption text for the reel
+            creation_id: Container ID from a previous attempt — when given,
+                container creation is skipped and we resume at poll/publish
 
         Returns:
             dict: {"post_id": str, "platform": "INSTAGRAM", "status": "POSTED"} on success
                   {"status": "SKIPPED", "message": "..."} if credentials missing
-                  {"status": "ERROR", "message": "..."} on failure
+                  {"status": "ERROR", "message": "...", "creation_id": ...} on failure
         """
         if not self.instagram_access_token or not self.instagram_user_id:
             logger.warning("Instagram credentials not configured, skipping Instagram post")
@@ -148,95 +306,112 @@ class AutoPoster:
                 "message": "Instagram credentials not configured"
             }
 
-        try:
-            logger.info(f"Starting Instagram Reels upload for video: {video_url} (Account: {self.instagram_user_id})")
-
-            # Step 1: Create media object
-            media_endpoint = f"https://graph.facebook.com/v18.0/{self.instagram_user_id}/media"
-            media_payload = {
-                "media_type": "REELS",
-                "video_url": video_url,
-                "caption": caption,
-                "access_token": self.instagram_access_token
-            }
-
-            logger.debug(f"Creating media object at {media_endpoint}")
-            media_response = requests.post(
-                media_endpoint,
-                json=media_payload,
-                timeout=self.request_timeout
-            )
-            media_response.raise_for_status()
-            media_data = media_response.json()
-
-            if "id" not in media_data:
-                error_msg = f"Failed to create Instagram media object: {media_data}"
-                logger.error(error_msg)
-                return {"status": "ERROR", "message": error_msg}
+        cached = self._cached_post(video_url, "INSTAGRAM")
+        if cached:
+            logger.info(f"Skipping Instagram post: {video_url} already posted ({cached.get('post_id')})")
+            return cached
 
-            creation_id = media_data["id"]
-            logger.info(f"Media object created with ID: {creation_id}")
+        # Reject oversized sources before Instagram (or we) move any bytes
+        size, _ = self._probe_video(video_url)
+        if size and size > self.IG_MAX_BYTES:
+            msg = f"Video is {size} bytes, over Instagram's {self.IG_MAX_BYTES} byte limit"
+            logger.warning(msg)
+            return {"status": "SKIPPED", "message": msg}
 
-            # Step 2: Poll for processing status (max 30 polls, 2 seconds each)
-            max_polls = 30
-            poll_interval = 2
-            status_endpoint = f"https://graph.facebook.com/v18.0/{creation_id}"
+        try:
+            logger.info(f"Starting Instagram Reels upload for video: {video_url} (Account: {self.instagram_user_id})")
 
-            for poll_count in range(max_polls):
-                logger.debug(f"Polling status (attempt {poll_count + 1}/{max_polls})")
-                time.sleep(poll_interval)
+            # Step 1: Create media object (skipped when resuming — the
+            # container from the failed attempt is still valid server-side)
+            if creation_id:
+                logger.info(f"Resuming Instagram publish from existing container {creation_id}")
+            else:
+                media_endpoint = self.ig_media_endpoint
+                media_payload = {
+                    "media_type": "REELS",
+                    "video_url": video_url,
+                    "caption": caption,
+                    "access_token": self.instagram_access_token
+                }
 
-                status_response = requests.get(
-                    status_endpoint,
-                    params={
-                        "fields": "status_code",
-                        "access_token": self.instagram_access_token
-                    },
+                logger.debug(f"Creating media object at {media_endpoint}")
+                self.GRAPH_BUCKET.acquire()
+                media_response = self.session.post(
+                    media_endpoint,
+                    json=media_payload,
                     timeout=self.request_timeout
                 )
-                status_response.raise_for_status()
-                status_data = status_response.json()
-                status_code = status_data.get("status_code")
-
-                logger.debug(f"Current status code: {status_code}")
-
-                if status_code == "FINISHED":
-                    logger.info(f"Media processing finished after {(poll_count + 1) * poll_interval} seconds")
-                    break
-            else:
-                # Polling timed out
-                error_msg = f"Media processing did not complete within {max_polls * poll_interval} seconds"
-                logger.error(error_msg)
-                return {"status": "ERROR", "message": error_msg}
-
-            # Step 3: Publish the media
-            publish_endpoint = f"https://graph.facebook.com/v18.0/{self.instagram_user_id}/media_publish"
-            publish_payload = {
-                "creation_id": creation_id,
-                "access_token": self.instagram_access_token
-            }
-
-            logger.debug(f"Publishing media at {publish_endpoint}")
-            publish_response = requests.post(
-                publish_endpoint,
-                json=publish_payload,
-                timeout=self.request_timeout
-            )
-            publish_response.raise_for_status()
-            publish_data = publish_response.json()
-
-            post_id = publish_data.get("id")
-            if not post_id:
-                error_msg = f"Failed to publish Instagram media: {publish_data}"
-                logger.error(error_msg)
-                return {"status": "ERROR", "message": error_msg}
-
-            logger.info(f"Successfully posted to Instagram Reels with post_id: {post_id}")
-            return {
-                "post_id": post_id,
-                "platform": "INSTAGRAM",
-                "status": "POSTED"
-            }
+                media_response.raise_for_status()
+                media_data = media_response.json()
+
+                if "id" not in media_data:
+                    error_msg = f"Failed to create Instagram media object: {media_data}"
+                    logger.error(error_msg)
+                    return {"status": "ERROR", "message": error_msg}
+
+                creation_id = media_data["id"]
+                logger.info(f"Media object created with ID: {creation_id}")
+
+            # Step 2+3: Poll for processing status with exponential backoff +
+            # jitter. Status lookups go through the shared poll board, which
+            # coalesces all in-flight containers into one ?ids=... request —
+            # B concurrent uploads cost ~1 status call per tick instead of B.
+            poll_budget = 300  # seconds of wall-clock time before giving up
+            deadline = time.monotonic() + poll_budget
+            start_time = time.monotonic()
+            interval = 0.5
+
+            self._register_ig_poll(creation_id)
+            try:
+                while time.monotonic() < deadline:
+                    # Full jitter: sleep anywhere in [0, interval] so a fast
+                    # completion is caught early and concurrent pollers decorrelate.
+                    delay = random.uniform(0, interval)
+                    logger.debug(f"Polling status in {delay:.1f}s (cap {interval:.1f}s)")
+                    time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+                    try:
+                        status_code = self._ig_status(creation_id)
+                    except requests.exceptions.HTTPError as e:
+                        # Back off harder on rate limits / server errors, then retry
+                        code = e.response.status_code if e.response is not None else 0
+                        if code == 429 or code >= 500:
+                            interval = min(interval * 2, 15)
+                            logger.warning(f"Status endpoint returned {code}, backing off to {interval:.1f}s")
+                            continue
+                        raise
+
+                    logger.debug(f"Current status code: {status_code}")
+
+                    if status_code == "ERROR":
+                        error_msg = "Instagram media processing failed (status ERROR)"
+                        logger.error(error_msg)
+                        return {"status": "ERROR", "message": error_msg, "creation_id": creation_id}
+
+                    if status_code == "FINISHED":
+                        result = self._publish_instagram_media(creation_id)
+                        if result.get("status") == "POSTED":
+                            self._remember_post(video_url, "INSTAGRAM", result)
+                            logger.info(
+                                f"Media published after {time.monotonic() - start_time:.1f} seconds "
+                                f"with post_id: {result['post_id']}"
+                            )
+                        else:
+                            result.setdefault("creation_id", creation_id)
+                        return result
+
+                    # Double the jitter cap (bounded) — later polls get cheaper
+                    # for Instagram while the jittered sleep above keeps
+                    # concurrent uploads out of lockstep.
+                    interval = min(interval * 2, 15)
+            finally:
+                self._unregister_ig_poll(creation_id)
+
+            error_msg = f"Media processing did not complete within {poll_budget} seconds"
+            logger.error(error_msg)
+            # Hand the container back so a retry can resume the poll instead
+            # of re-submitting the video
+            return {"status": "ERROR", "message": error_msg, "creation_id": creation_id}
 
         except requests.exceptions.Timeout as e:
             error_msg = f"Instagram API timeout: {str(e)}"
@@ -251,6 +426,191 @@ class AutoPoster:
             logger.error(error_msg, exc_info=True)
             return {"status": "ERROR", "message": error_msg}
 
+    def _post_instagram_clip(self, video_url: str, caption: str, prev: dict) -> dict:
+        """
+        Instagram dispatch for post_clip: when webhook publishing is enabled
+        the container is created and left for the media webhook to publish
+        (no worker blocks in the status poll); otherwise, and on retries
+        where a container already exists, the polling path runs as before.
+        """
+        creation_id = prev.get("creation_id")
+        if settings.instagram_webhook_publish and not creation_id:
+            return self.begin_instagram_reel(video_url, caption)
+        return self.post_to_instagram_reels(video_url, caption, creation_id=creation_id)
+
+    def begin_instagram_reel(self, video_url: str, caption: str) -> dict:
+        """
+        Webhook-friendly entry point: create the Reels container and return
+        immediately instead of blocking in the status poll. Pair with
+        finish_instagram_publish() from the media webhook (see
+        /pipeline/webhooks/instagram) or a later retry.
+
+        Returns:
+            dict: {"status": "PENDING", "creation_id": str} on success
+                  {"status": "SKIPPED"/"ERROR", "message": "..."} otherwise
+        """
+        if not self.instagram_access_token or not self.instagram_user_id:
+            return {"status": "SKIPPED", "message": "Instagram credentials not configured"}
+
+        try:
+            media_endpoint = self.ig_media_endpoint
+            self.GRAPH_BUCKET.acquire()
+            response = self.session.post(
+                media_endpoint,
+                json={
+                    "media_type": "REELS",
+                    "video_url": video_url,
+                    "caption": caption,
+                    "access_token": self.instagram_access_token
+                },
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
+            creation_id = response.json().get("id")
+            if not creation_id:
+                return {"status": "ERROR", "message": f"No creation ID in response: {response.json()}"}
+
+            logger.info(f"Reels container {creation_id} created; awaiting webhook to publish")
+            return {"status": "PENDING", "creation_id": creation_id, "platform": "INSTAGRAM"}
+        except Exception as e:
+            logger.error(f"Failed to create Reels container: {e}")
+            return {"status": "ERROR", "message": str(e)}
+
+    def finish_instagram_publish(self, creation_id: str) -> dict:
+        """
+        Publish a container created earlier via begin_instagram_reel. Called
+        from the media-status webhook once processing completes, so no CPU or
+        API quota is spent polling.
+        """
+        if not self.instagram_access_token or not self.instagram_user_id:
+            return {"status": "SKIPPED", "message": "Instagram credentials not configured"}
+
+        result = self._publish_instagram_media(creation_id)
+        if result.get("status") == "POSTED":
+            logger.info(f"Webhook publish complete for container {creation_id}: post {result['post_id']}")
+        return result
+
+    def _publish_instagram_media(self, creation_id: str) -> dict:
+        """
+        POST media_publish for a finished container. Shared by the webhook
+        path and the photo flow — one call site for the rate bucket, payload
+        shape and error handling.
+        """
+        try:
+            self.GRAPH_BUCKET.acquire()
+            response = self.session.post(
+                self.ig_publish_endpoint,
+                json={
+                    "creation_id": creation_id,
+                    "access_token": self.instagram_access_token
+                },
+                timeout=self.request_timeout
+            )
+            response.raise_for_status()
+            post_id = response.json().get("id")
+            if not post_id:
+                return {"status": "ERROR", "message": f"Failed to publish: {response.json()}"}
+            return {"post_id": post_id, "platform": "INSTAGRAM", "status": "POSTED"}
+        except Exception as e:
+            logger.error(f"Instagram publish failed for container {creation_id}: {e}")
+            return {"status": "ERROR", "message": str(e)}
+
+    def _require_facebook_page(self):
+        """
+        Common Facebook preamble: return (token, page_id, None) when posting
+        is possible, else (None, None, skip_dict) to hand straight back.
+        """
+        if not self.facebook_access_token:
+            return None, None, {"status": "SKIPPED", "message": "Facebook/Meta credentials missing"}
+        if not self.facebook_page_id:
+            logger.warning("Facebook Page ID missing, skipping post")
+            return None, None, {"status": "SKIPPED", "message": "FACEBOOK_PAGE_ID missing"}
+        return self.facebook_access_token, self.facebook_page_id, None
+
+    POSTED_CACHE_MAX = 256
+
+    def _cached_post(self, video_url: str, platform: str):
+        """Return the remembered POSTED result for this URL+platform, if any."""
+        with self._posted_cache_lock:
+            return self._posted_cache.get((video_url, platform))
+
+    def _remember_post(self, video_url: str, platform: str, result: dict):
+        """Record a successful post; oldest entries fall off past the cap."""
+        with self._posted_cache_lock:
+            self._posted_cache[(video_url, platform)] = result
+            while len(self._posted_cache) > self.POSTED_CACHE_MAX:
+                self._posted_cache.popitem(last=False)
+
+    def _probe_video(self, video_url: str):
+        """
+        HEAD the source once to learn its size and type before moving bytes.
+
+        Results are cached per URL, so a clip fanned out to three platforms
+        costs one probe. Returns (size_or_None, content_type_or_None); both
+        None when the probe itself fails (callers treat that as unknown, not
+        fatal — some origins reject HEAD).
+        """
+        cached = self._probe_cache.get(video_url)
+        if cached:
+            return cached
+
+        try:
+            response = self.session.head(video_url, allow_redirects=True, timeout=10)
+            response.raise_for_status()
+            length = response.headers.get("Content-Length")
+            result = (int(length) if length else None,
+                      response.headers.get("content-type"))
+        except Exception as e:
+            logger.debug(f"HEAD probe failed for {video_url}: {e}")
+            result = (None, None)
+
+        self._probe_cache[video_url] = result
+        return result
+
+    def _register_ig_poll(self, creation_id: str):
+        """Add a container to the shared poll board."""
+        with self._ig_poll_lock:
+            self._ig_pending[creation_id] = True
+
+    def _unregister_ig_poll(self, creation_id: str):
+        """Drop a container (and its cached status) from the poll board."""
+        with self._ig_poll_lock:
+            self._ig_pending.pop(creation_id, None)
+            self._ig_statuses.pop(creation_id, None)
+
+    def _ig_status(self, creation_id: str) -> str:
+        """
+        Return the container's status_code, serving from the board cache when
+        another poller fetched it within _IG_STATUS_TTL. On a miss, one GET
+        with ?ids=<every pending container> refreshes the whole board.
+        """
+        now = time.monotonic()
+        with self._ig_poll_lock:
+            cached = self._ig_statuses.get(creation_id)
+            if cached and now - cached[1] < self._IG_STATUS_TTL:
+                return cached[0]
+            ids = list(self._ig_pending) or [creation_id]
+
+        self.GRAPH_BUCKET.acquire()
+        response = self.session.get(
+            "https://graph.facebook.com/v18.0/",
+            params={
+                "ids": ",".join(ids),
+                "fields": "status_code",
+                "access_token": self.instagram_access_token
+            },
+            timeout=self.request_timeout
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        now = time.monotonic()
+        with self._ig_poll_lock:
+            for cid, body in data.items():
+                self._ig_statuses[cid] = ((body or {}).get("status_code"), now)
+            cached = self._ig_statuses.get(creation_id)
+        return cached[0] if cached else None
+
     def post_to_youtube_shorts(self, video_url: str, title: str, description: str, tags: list = None) -> dict:
         """
         Post a clip to YouTube Shorts.
@@ -273,6 +633,18 @@ class AutoPoster:
                 "message": "YouTube credentials not configured"
             }
 
+        cached = self._cached_post(video_url, "YOUTUBE")
+        if cached:
+            logger.info(f"Skipping YouTube post: {video_url} already posted ({cached.get('video_id')})")
+            return cached
+
+        # Reject oversized sources before downloading a single byte
+        size, _ = self._probe_video(video_url)
+        if size and size > self.YOUTUBE_MAX_BYTES:
+            msg = f"Video is {size} bytes, over YouTube's {self.YOUTUBE_MAX_BYTES} byte limit"
+            logger.warning(msg)
+            return {"status": "SKIPPED", "message": msg}
+
         temp_file_path = None
         try:
             logger.info(f"Starting YouTube Shorts upload for video: {video_url}")
@@ -285,42 +657,53 @@ class AutoPoster:
                 logger.error(error_msg)
                 return {"status": "ERROR", "message": error_msg}
 
-            # Step 2: Download video from video_url to /tmp
-            logger.debug(f"Downloading video from {video_url}")
-            temp_file_path = self._download_video(video_url)
-            if not temp_file_path or not os.path.exists(temp_file_path):
-                error_msg = "Failed to download video file"
-                logger.error(error_msg)
-                return {"status": "ERROR", "message": error_msg}
-
-            # Step 3: Add "#Shorts" to title
+            # Step 2: Add "#Shorts" to title
             youtube_title = f"{title} #Shorts"
             if tags is None:
                 tags = []
             tags.append("Shorts")
 
-            # Step 4: Initiate resumable upload
-            logger.debug("Initiating resumable upload")
-            upload_url = self._initiate_resumable_upload(access_token, youtube_title, description, tags)
-            if not upload_url:
-                error_msg = "Failed to initiate resumable upload"
-                logger.error(error_msg)
-                return {"status": "ERROR", "message": error_msg}
+            # Step 3: Pipe the source URL straight into a fresh upload session.
+            # The session is initiated with the exact byte count, so YouTube
+            # treats the single PUT as the complete upload (single-request
+            # mode) — no chunk framing or follow-up Content-Range requests.
+            logger.debug(f"Streaming video from {video_url}")
+            video_id = self._stream_upload_from_url(access_token, video_url, youtube_title, description, tags)
+
+            # Step 4: Fallback — download to /tmp and upload from disk (e.g.
+            # sources that don't report Content-Length)
+            if not video_id:
+                logger.debug(f"Falling back to disk download for {video_url}")
+                temp_file_path = self._download_video(video_url)
+                if not temp_file_path or not os.path.exists(temp_file_path):
+                    error_msg = "Failed to download video file"
+                    logger.error(error_msg)
+                    return {"status": "ERROR", "message": error_msg}
+
+                upload_url = self._initiate_resumable_upload(
+                    access_token, youtube_title, description, tags,
+                    content_length=os.path.getsize(temp_file_path)
+                )
+                if not upload_url:
+                    error_msg = "Failed to initiate resumable upload"
+                    logger.error(error_msg)
+                    return {"status": "ERROR", "message": error_msg}
+
+                video_id = self._upload_video_bytes(upload_url, temp_file_path, access_token)
 
-            # Step 5: Upload video bytes
-            logger.debug(f"Uploading video to {upload_url}")
-            video_id = self._upload_video_bytes(upload_url, temp_file_path, access_token)
             if not video_id:
                 error_msg = "Failed to upload video bytes"
                 logger.error(error_msg)
                 return {"status": "ERROR", "message": error_msg}
 
             logger.info(f"Successfully posted to YouTube Shorts with video_id: {video_id}")
-            return {
+            result = {
                 "video_id": video_id,
                 "platform": "YOUTUBE",
                 "status": "POSTED"
             }
+            self._remember_post(video_url, "YOUTUBE", result)
+            return result
 
         except Exception as e:
             error_msg = f"Unexpected error posting to YouTube: {str(e)}"
@@ -337,36 +720,45 @@ class AutoPoster:
 
     def _refresh_youtube_token(self) -> str:
         """
-        Refresh YouTube OAuth2 access token.
+        Return a valid YouTube OAuth2 access token, refreshing only when the
+        cached one is missing or within 60s of expiry.
 
         Returns:
-            str: The new access_token on success, empty string on failure
+            str: The access_token on success, empty string on failure
         """
+        # Fast path: cached token still comfortably valid
+        if self._yt_token and time.monotonic() < self._yt_token_expires_at - 60:
+            return self._yt_token
+
         try:
-            token_endpoint = "https://oauth2.googleapis.com/token"
-            payload = {
-                "client_id": self.youtube_client_id,
-                "client_secret": self.youtube_client_secret,
-                "refresh_token": self.youtube_refresh_token,
-                "grant_type": "refresh_token"
-            }
+            # Lock so concurrent posts don't all hit the token endpoint at once
+            with self._yt_token_lock:
+                # Another thread may have refreshed while we waited
+                if self._yt_token and time.monotonic() < self._yt_token_expires_at - 60:
+                    return self._yt_token
+
+                token_endpoint = "https://oauth2.googleapis.com/token"
+
+                logger.debug(f"Requesting new access token from {token_endpoint}")
+                self.YOUTUBE_BUCKET.acquire()
+                response = self.session.post(
+                    token_endpoint,
+                    data=self._yt_token_payload,
+                    timeout=self.request_timeout
+                )
+                response.raise_for_status()
+                token_data = response.json()
 
-            logger.debug(f"Requesting new access token from {token_endpoint}")
-            response = requests.post(
-                token_endpoint,
-                data=payload,
-                timeout=self.request_timeout
-            )
-            response.raise_for_status()
-            token_data = response.json()
+                access_token = token_data.get("access_token")
+                if not access_token:
+                    logger.error(f"No access_token in response: {token_data}")
+                    return ""
 
-            access_token = token_data.get("access_token")
-            if not access_token:
-                logger.error(f"No access_token in response: {token_data}")
-                return ""
+                AutoPoster._yt_token = access_token
+                AutoPoster._yt_token_expires_at = time.monotonic() + token_data.get("expires_in", 3600)
 
-            logger.debug("YouTube access token refreshed successfully")
-            return access_token
+                logger.debug("YouTube access token refreshed successfully")
+                return access_token
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to refresh YouTube token: {str(e)}")
@@ -375,6 +767,131 @@ class AutoPoster:
             logger.error(f"Unexpected error refreshing YouTube token: {str(e)}", exc_info=True)
             return ""
 
+    def _stream_upload_from_url(self, access_token: str, video_url: str, title: str,
+                                description: str, tags: list) -> str:
+        """
+        Stream the source video directly into a resumable upload session.
+
+        Opens the source stream first so the session can be initiated with the
+        exact Content-Length (YouTube needs the total size for a
+        single-request upload). Returns an empty string when streaming is not
+        possible or fails, so the caller can fall back to the disk-based path.
+
+        Args:
+            access_token: YouTube API access token
+            video_url: URL of the source video
+            title: Video title
+            description: Video description
+            tags: List of tags
+
+        Returns:
+            str: Video ID on success, empty string otherwise
+        """
+        try:
+            with self.session.get(
+                video_url, stream=True, timeout=self.request_timeout,
+                headers={"Accept-Encoding": "identity"}
+            ) as source:
+                source.raise_for_status()
+
+                content_length = source.headers.get("Content-Length")
+                content_type = source.headers.get("content-type", "application/octet-stream")
+
+                if not content_length:
+                    # Unknown total size — use the resumable protocol's
+                    # open-ended Content-Range form ("bytes X-Y/*") and close
+                    # it on the final chunk. No disk round-trip needed.
+                    logger.debug("Source has no Content-Length; streaming in open-ended chunks")
+                    upload_url = self._initiate_resumable_upload(
+                        access_token, title, description, tags,
+                        content_type=content_type
+                    )
+                    if not upload_url:
+                        return ""
+                    return self._stream_chunks_to_upload(upload_url, source, content_type)
+
+                upload_url = self._initiate_resumable_upload(
+                    access_token, title, description, tags,
+                    content_length=content_length,
+                    content_type=content_type
+                )
+                if not upload_url:
+                    return ""
+
+                # The wrapper carries the size; requests sets Content-Length
+                # from it and must not see a second, manual copy
+                logger.debug(f"Streaming {content_length} bytes from source to YouTube")
+                response = self.session.put(
+                    upload_url,
+                    data=_SizedStream(source.raw, int(content_length)),
+                    headers={"Content-Type": content_type},
+                    timeout=self.request_timeout * 2
+                )
+                response.raise_for_status()
+
+            response_data = response.json()
+            video_id = response_data.get("id")
+            if not video_id:
+                logger.error(f"No video ID in streamed upload response: {response_data}")
+                return ""
+
+            logger.info(f"Video streamed to YouTube successfully with ID: {video_id}")
+            return video_id
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Streamed upload failed: {str(e)}")
+            return ""
+        except Exception as e:
+            logger.error(f"Unexpected error during streamed upload: {str(e)}", exc_info=True)
+            return ""
+
+    def _stream_chunks_to_upload(self, upload_url: str, source, content_type: str) -> str:
+        """
+        Pump a source response of unknown length into a resumable upload.
+
+        Reads one chunk ahead so the final chunk can carry the closing
+        Content-Range total ("bytes X-Y/total") while earlier chunks use the
+        open-ended "bytes X-Y/*" form. Only one chunk is held in memory;
+        chunks cannot be replayed from a live stream, so a mid-stream failure
+        falls back to the disk-based path in the caller.
+
+        Returns:
+            str: Video ID on success, empty string on failure
+        """
+        offset = 0
+        chunks = source.iter_content(chunk_size=self.UPLOAD_CHUNK_SIZE)
+        pending = next(chunks, None)
+        if pending is None:
+            logger.error("Source stream was empty")
+            return ""
+
+        while pending is not None:
+            chunk = pending
+            pending = next(chunks, None)
+            end = offset + len(chunk) - 1
+            total = str(end + 1) if pending is None else "*"
+            response = self.session.put(
+                upload_url,
+                data=chunk,
+                headers={
+                    "Content-Type": content_type,
+                    "Content-Length": str(len(chunk)),
+                    "Content-Range": f"bytes {offset}-{end}/{total}"
+                },
+                timeout=self.request_timeout * 2
+            )
+            if response.status_code == 308:
+                offset = end + 1
+                continue
+            response.raise_for_status()
+            video_id = response.json().get("id", "")
+            if video_id:
+                logger.info(f"Video streamed to YouTube successfully with ID: {video_id}")
+            return video_id
+
+        logger.error("Chunked stream upload ended without a final response")
+        return ""
+
     def _download_video(self, video_url: str) -> str:
         """
         Download video from URL to /tmp directory.
@@ -387,9 +904,58 @@ class AutoPoster:
         """
         try:
             logger.debug(f"Downloading video from {video_url}")
-            response = requests.get(video_url, timeout=self.request_timeout, stream=True)
+
+            cache_base = os.path.join(
+                self.DOWNLOAD_CACHE_DIR,
+                hashlib.sha1(video_url.encode("utf-8")).hexdigest()
+            )
+            meta_path = cache_base + ".meta"
+
+            # Conditional GET: if we have a cached copy with an ETag, ask the
+            # origin to confirm it's still current instead of resending bytes
+            request_headers = {}
+            cache_meta = None
+            if os.path.exists(meta_path):
+                try:
+                    with open(meta_path, "r") as mf:
+                        cache_meta = json.load(mf)
+                    if cache_meta.get("etag") and os.path.exists(cache_meta.get("file", "")):
+                        request_headers["If-None-Match"] = cache_meta["etag"]
+                    else:
+                        cache_meta = None
+                except Exception:
+                    cache_meta = None
+
+            # Identity encoding: video is already compressed, and a gzip'd
+            # body would make Content-Length lie about the bytes on disk
+            request_headers["Accept-Encoding"] = "identity"
+            response = self.session.get(
+                video_url, timeout=self.request_timeout, stream=True, headers=request_headers
+            )
+
+            if response.status_code == 304 and cache_meta:
+                logger.info(f"Download cache hit (304 Not Modified) for {video_url}")
+                # Callers delete the returned file after upload, so hand back
+                # a fresh temp copy and keep the cached original
+                suffix = os.path.splitext(cache_meta["file"])[1]
+                with tempfile.NamedTemporaryFile(
+                    prefix="biru_bhai_video_", suffix=suffix, delete=False
+                ) as f:
+                    temp_file_path = f.name
+                shutil.copy(cache_meta["file"], temp_file_path)
+                return temp_file_path
+
             response.raise_for_status()
 
+            # Short-circuit oversized files before a single byte hits disk
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > self.MAX_DOWNLOAD_BYTES:
+                logger.error(
+                    f"Download rejected: {content_length} bytes exceeds "
+                    f"{self.MAX_DOWNLOAD_BYTES} byte limit for {video_url}"
+                )
+                return ""
+
             # Determine file extension from Content-Type header
             content_type = response.headers.get("content-type", "video/mp4")
             file_extension = "mp4"
@@ -398,18 +964,47 @@ class AutoPoster:
             elif "quicktime" in content_type:
                 file_extension = "mov"
 
-            # Create temp file
-            temp_file_path = os.path.join(
-                "/tmp" if os.name != "nt" else os.environ.get("TEMP", "C:\\temp"),
-                f"biru_bhai_video_{int(time.time())}.{file_extension}"
-            )
-
-            # Write video bytes to temp file
-            with open(temp_file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
+            # Collision-safe temp file (time-based names clash when two
+            # downloads land in the same second)
+            with tempfile.NamedTemporaryFile(
+                prefix="biru_bhai_video_",
+                suffix=f".{file_extension}",
+                delete=False
+            ) as f:
+                temp_file_path = f.name
+                if content_length:
+                    # Size already validated — bulk copy in 1MB chunks (far
+                    # fewer Python-level iterations and syscalls than an 8KB
+                    # loop). decode_content guards against an origin that
+                    # compresses despite our Accept-Encoding: identity.
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+                else:
+                    # No declared size — count as we go and bail if it balloons
+                    written = 0
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        written += len(chunk)
+                        if written > self.MAX_DOWNLOAD_BYTES:
+                            logger.error(
+                                f"Download aborted: body exceeded "
+                                f"{self.MAX_DOWNLOAD_BYTES} byte limit for {video_url}"
+                            )
+                            os.remove(temp_file_path)
+                            return ""
                         f.write(chunk)
 
+            # Populate the cache when the origin supports revalidation
+            etag = response.headers.get("ETag")
+            if etag:
+                try:
+                    os.makedirs(self.DOWNLOAD_CACHE_DIR, exist_ok=True)
+                    cached_file = f"{cache_base}.{file_extension}"
+                    shutil.copy(temp_file_path, cached_file)
+                    with open(meta_path, "w") as mf:
+                        json.dump({"etag": etag, "file": cached_file}, mf)
+                except Exception as e:
+                    logger.warning(f"Could not cache download for {video_url}: {e}")
+
             file_size = os.path.getsize(temp_file_path)
             logger.info(f"Video downloaded successfully to {temp_file_path} ({file_size} bytes)")
             return temp_file_path
@@ -421,7 +1016,8 @@ class AutoPoster:
             logger.error(f"Unexpected error downloading video: {str(e)}", exc_info=True)
             return ""
 
-    def _initiate_resumable_upload(self, access_token: str, title: str, description: str, tags: list) -> str:
+    def _initiate_resumable_upload(self, access_token: str, title: str, description: str, tags: list,
+                                   content_length=None, content_type: str = "application/octet-stream") -> str:
         """
         Initiate a resumable upload session with YouTube.
 
@@ -430,6 +1026,10 @@ class AutoPoster:
             title: Video title
             description: Video description
             tags: List of tags
+            content_length: Total upload size in bytes, if known. Announcing it
+                upfront lets YouTube validate and accept the whole body in one
+                PUT (single-request mode) instead of negotiating chunks.
+            content_type: MIME type of the video bytes
 
         Returns:
             str: Resumable upload URL on success, empty string on failure
@@ -438,8 +1038,11 @@ class AutoPoster:
             upload_endpoint = "https://www.googleapis.com/upload/youtube/v3/videos"
             headers = {
                 "Authorization": f"Bearer {access_token}",
-                "X-Goog-Upload-Protocol": "resumable"
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Upload-Content-Type": content_type
             }
+            if content_length is not None:
+                headers["X-Upload-Content-Length"] = str(content_length)
             params = {
                 "uploadType": "resumable",
                 "part": "snippet,status"
@@ -457,7 +1060,8 @@ class AutoPoster:
             }
 
             logger.debug(f"Initiating resumable upload to {upload_endpoint}")
-            response = requests.post(
+            self.YOUTUBE_BUCKET.acquire()
+            response = self.session.post(
                 upload_endpoint,
                 headers=headers,
                 params=params,
@@ -481,9 +1085,19 @@ class AutoPoster:
             logger.error(f"Unexpected error initiating resumable upload: {str(e)}", exc_info=True)
             return ""
 
+    # Resumable upload chunk size — must be a multiple of 256KB per the
+    # YouTube docs; 16MB keeps request count low for typical Shorts.
+    UPLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
     def _upload_video_bytes(self, upload_url: str, file_path: str, access_token: str) -> str:
         """
-        Upload video bytes to the resumable upload URL.
+        Upload video bytes to the resumable upload URL in sequential
+        Content-Range chunks.
+
+        The resumable protocol requires bytes in order (parallel ranges are
+        not accepted by the upload server), but chunking means a transient
+        failure only costs the current chunk: we re-query the server's
+        committed offset and resume instead of restarting the whole file.
 
         Args:
             upload_url: The resumable upload URL
@@ -497,28 +1111,69 @@ class AutoPoster:
             file_size = os.path.getsize(file_path)
             logger.debug(f"Uploading video file ({file_size} bytes) to {upload_url}")
 
+            offset = 0
+            retries = 0
             with open(file_path, "rb") as f:
-                headers = {
-                    "Content-Type": "application/octet-stream",
-                    "Content-Length": str(file_size)
-                }
-                response = requests.put(
-                    upload_url,
-                    data=f,
-                    headers=headers,
-                    timeout=self.request_timeout * 2  # Longer timeout for large uploads
-                )
-                response.raise_for_status()
-
-            # Parse response to get video ID
-            response_data = response.json()
-            video_id = response_data.get("id")
-            if not video_id:
-                logger.error(f"No video ID in upload response: {response_data}")
-                return ""
-
-            logger.info(f"Video uploaded successfully with ID: {video_id}")
-            return video_id
+                self._advise_sequential(f)
+                while offset < file_size:
+                    f.seek(offset)
+                    chunk = f.read(self.UPLOAD_CHUNK_SIZE)
+                    end = offset + len(chunk) - 1
+                    headers = {
+                        "Content-Type": "application/octet-stream",
+                        "Content-Length": str(len(chunk)),
+                        "Content-Range": f"bytes {offset}-{end}/{file_size}"
+                    }
+
+                    try:
+                        response = self.session.put(
+                            upload_url,
+                            data=chunk,
+                            headers=headers,
+                            timeout=self.request_timeout * 2
+                        )
+                    except requests.exceptions.RequestException as e:
+                        retries += 1
+                        if retries > 5:
+                            logger.error(f"Chunk upload failed after {retries} retries: {e}")
+                            return ""
+                        time.sleep(random.uniform(0, min(2 ** retries, 30)))
+                        offset = max(0, self._query_upload_offset(upload_url, file_size))
+                        continue
+
+                    if response.status_code == 308:
+                        # Chunk accepted — server tells us how far it got
+                        retries = 0
+                        range_header = response.headers.get("Range", "")
+                        if "-" in range_header:
+                            offset = int(range_header.rsplit("-", 1)[1]) + 1
+                        else:
+                            offset = end + 1
+                        continue
+
+                    if response.status_code == 429 or response.status_code >= 500:
+                        retries += 1
+                        if retries > 5:
+                            logger.error(f"Chunk upload gave up after HTTP {response.status_code}")
+                            return ""
+                        time.sleep(random.uniform(0, min(2 ** retries, 30)))
+                        offset = max(0, self._query_upload_offset(upload_url, file_size))
+                        continue
+
+                    response.raise_for_status()
+
+                    # Final chunk — response carries the video resource
+                    response_data = response.json()
+                    video_id = response_data.get("id")
+                    if not video_id:
+                        logger.error(f"No video ID in upload response: {response_data}")
+                        return ""
+
+                    logger.info(f"Video uploaded successfully with ID: {video_id}")
+                    return video_id
+
+            logger.error("Upload loop ended without a final response from YouTube")
+            return ""
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to upload video bytes: {str(e)}")
@@ -527,6 +1182,53 @@ class AutoPoster:
             logger.error(f"Unexpected error uploading video bytes: {str(e)}", exc_info=True)
             return ""
 
+    @staticmethod
+    def _file_sha256(file_path: str) -> str:
+        """
+        SHA-256 of a file via hashlib.file_digest — hashes in C with zero-copy
+        reads instead of a Python-level read loop. Use this for any upload
+        integrity checks rather than hand-rolling a chunked update() loop.
+        """
+        with open(file_path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    @staticmethod
+    def _advise_sequential(f):
+        """
+        Hint the kernel that this file will be read once, front to back, so it
+        can read ahead aggressively and drop pages behind us. No-op on
+        platforms without posix_fadvise.
+        """
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+
+    def _query_upload_offset(self, upload_url: str, file_size: int) -> int:
+        """
+        Ask the resumable upload server how many bytes it has committed
+        (Content-Range: bytes */total probe). Returns the next offset to send
+        from, or 0 if the server reports nothing committed.
+        """
+        try:
+            response = self.session.put(
+                upload_url,
+                headers={
+                    "Content-Length": "0",
+                    "Content-Range": f"bytes */{file_size}"
+                },
+                timeout=self.request_timeout
+            )
+            if response.status_code == 308:
+                range_header = response.headers.get("Range", "")
+                if "-" in range_header:
+                    return int(range_header.rsplit("-", 1)[1]) + 1
+            return 0
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not query upload offset: {e}")
+            return 0
+
     def post_to_instagram_photo(self, image_url: str, caption: str) -> dict:
         """
         Post a photo to Instagram Feed.
@@ -537,13 +1239,13 @@ class AutoPoster:
         try:
             logger.info(f"Starting Instagram Photo upload: {image_url}")
             # Step 1: Create Container
-            url = f"https://graph.facebook.com/v18.0/{self.instagram_user_id}/media"
+            url = self.ig_media_endpoint
             payload = {
                 "image_url": image_url,
                 "caption": caption,
                 "access_token": self.instagram_access_token
             }
-            res = requests.post(url, json=payload, timeout=30)
+            res = self.session.post(url, json=payload, timeout=30)
             res.raise_for_status()
             creation_id = res.json().get("id")
 
@@ -552,13 +1254,8 @@ class AutoPoster:
             
             # Instagram requires waiting for media to be 'READY' usually only for video, but safer to check or just publish for image.
             # Images are usually ready immediately.
-            
-            pub_url = f"https://graph.facebook.com/v18.0/{self.instagram_user_id}/media_publish"
-            pub_payload = {"creation_id": creation_id, "access_token": self.instagram_access_token}
-            pub_res = requests.post(pub_url, json=pub_payload, timeout=30)
-            pub_res.raise_for_status()
-            
-            return {"post_id": pub_res.json().get("id"), "platform": "INSTAGRAM", "status": "POSTED"}
+
+            return self._publish_instagram_media(creation_id)
         except Exception as e:
             return {"status": "ERROR", "message": str(e)}
 
@@ -566,13 +1263,10 @@ class AutoPoster:
         """
         Post a photo to Facebook Page. Supports local file path or URL.
         """
-        fb_token = self.facebook_access_token
-        target_id = self.facebook_page_id
-        
-        if not fb_token: return {"status": "SKIPPED", "message": "No FB Token"}
-        if not target_id: return {"status": "SKIPPED", "message": "No FB Page ID"}
-        
-        url = f"https://graph.facebook.com/v18.0/{target_id}/photos"
+        fb_token, target_id, err = self._require_facebook_page()
+        if err: return err
+
+        url = self.fb_photos_endpoint
         try:
             params = {
                 "caption": caption,
@@ -584,12 +1278,12 @@ class AutoPoster:
                 logger.info(f"Uploading local photo to FB: {image_url}")
                 with open(image_url, 'rb') as f:
                     # 'source' is the field for file upload
-                    res = requests.post(url, data=params, files={'source': f}, timeout=60)
+                    res = self.session.post(url, data=params, files={'source': f}, timeout=60)
             else:
                 # Use URL
                 logger.info(f"Posting photo URL to FB: {image_url}")
                 params["url"] = image_url
-                res = requests.post(url, params=params, timeout=45)
+                res = self.session.post(url, params=params, timeout=45)
 
             res.raise_for_status()
             return {"post_id": res.json().get("id"), "platform": "FACEBOOK", "status": "POSTED"}
@@ -603,36 +1297,45 @@ class AutoPoster:
         results = []
         logger.info(f"Starting multi-platform image post to: {', '.join(platforms)}")
 
-        for platform in platforms:
-            p_upper = platform.upper()
-            if p_upper == "INSTAGRAM":
-                res = self.post_to_instagram_photo(image_url, caption)
-            elif p_upper == "FACEBOOK":
-                res = self.post_to_facebook_photo(image_url, caption)
-            else:
-                res = {"status": "SKIPPED", "message": f"Platform {platform} not supported for images"}
-            
-            if 'platform' not in res: res['platform'] = p_upper
-            results.append(res)
-        
+        # Same fan-out as post_clip: the targets are independent hosts, so
+        # posting them concurrently costs max(platform) instead of the sum.
+        with ThreadPoolExecutor(max_workers=max(1, len(platforms))) as pool:
+            futures = [
+                pool.submit(self._post_image_to_platform, platform, image_url, caption)
+                for platform in platforms
+            ]
+            for platform, future in zip(platforms, futures):
+                try:
+                    res = future.result()
+                except Exception as e:
+                    logger.error(f"Image post to {platform} raised: {e}", exc_info=True)
+                    res = {"status": "ERROR", "message": str(e)}
+                if 'platform' not in res: res['platform'] = platform.upper()
+                results.append(res)
+
         return results
 
+    def _post_image_to_platform(self, platform: str, image_url: str, caption: str) -> dict:
+        """Dispatch a single image post to one platform (runs on a worker thread)."""
+        fn = self._image_dispatch.get(platform.upper())
+        if fn is None:
+            return {"status": "SKIPPED", "message": f"Platform {platform} not supported for images"}
+        return fn(image_url, caption)
+
     def post_to_facebook_video(self, video_url: str, caption: str) -> dict:
         """
         Post a clip to Facebook Video/Reels.
         Note: Requires Page Access Token with 'pages_manage_posts' permission.
         """
-        fb_token = self.facebook_access_token
-        target_id = self.facebook_page_id
+        cached = self._cached_post(video_url, "FACEBOOK")
+        if cached:
+            logger.info(f"Skipping Facebook post: {video_url} already posted ({cached.get('post_id')})")
+            return cached
 
-        if not fb_token:
-            return {"status": "SKIPPED", "message": "Facebook/Meta credentials missing"}
+        fb_token, target_id, err = self._require_facebook_page()
+        if err: return err
 
-        if not target_id:
-             logger.warning("Facebook Page ID missing. Simulating post.")
-             return {"post_id": "simulated_fb_id_123", "platform": "FACEBOOK", "status": "SKIPPED", "message": "FACEBOOK_PAGE_ID missing"}
-        
-        endpoint = f"https://graph.facebook.com/v18.0/{target_id}/videos"
+        endpoint = self.fb_videos_endpoint
         try:
             logger.info(f"Posting to Facebook Page: {target_id}")
             payload = {
@@ -642,23 +1345,32 @@ class AutoPoster:
             }
             
             # Real API Request
-            resp = requests.post(endpoint, json=payload, timeout=60)
+            resp = self.session.post(endpoint, json=payload, timeout=60)
             resp.raise_for_status()
             data = resp.json()
             logger.info(f"Facebook post successful: {data.get('id')}")
-            return {"post_id": data.get("id"), "platform": "FACEBOOK", "status": "POSTED"}
+            result = {"post_id": data.get("id"), "platform": "FACEBOOK", "status": "POSTED"}
+            self._remember_post(video_url, "FACEBOOK", result)
+            return result
 
         except Exception as e:
             logger.error(f"Facebook Post Failed: {e}")
             return {"status": "ERROR", "message": f"Facebook Post Failed: {e}"}
 
-    def post_clip(self, video_url: str, platforms: list, captions: dict = None, title: str = None) -> list:
+    def post_clip(self, video_url: str, platforms: list, captions: dict = None, title: str = None,
+                  state: dict = None) -> list:
         """
         Post a clip to multiple platforms with specific captions.
+
+        `state` is an optional mutable dict (platform -> last result) that
+        callers persist between attempts (e.g. in pipeline_data): platforms
+        that already POSTED are skipped entirely, and Instagram retries
+        resume from the saved creation_id instead of re-submitting the video.
         """
         results = []
         if captions is None: captions = {}
-        
+        if state is None: state = {}
+
         # Fallback values
         defaults = {
             'ig': captions.get('ig') or title or "New Video",
@@ -668,22 +1380,61 @@ class AutoPoster:
 
         logger.info(f"Starting multi-platform post to: {', '.join(platforms)}")
 
-        for platform in platforms:
-            p_upper = platform.upper()
-            logger.debug(f"Processing platform: {p_upper}")
+        # Each platform post is network-bound (Instagram alone can block for
+        # minutes while polling), so fan them out across a thread pool and
+        # gather: wall-clock cost becomes max-of-platforms, not sum.
+        with ThreadPoolExecutor(max_workers=max(1, len(platforms))) as pool:
+            futures = {}
+            for platform in platforms:
+                prev = state.get(platform.upper()) or {}
+                if prev.get("status") == "POSTED":
+                    logger.info(f"Skipping {platform.upper()}: already posted on a previous attempt")
+                    continue
+                futures[platform] = pool.submit(
+                    self._post_clip_to_platform, platform, video_url, defaults, prev
+                )
 
-            if p_upper == "INSTAGRAM":
-                res = self.post_to_instagram_reels(video_url, defaults['ig'])
-            elif p_upper == "YOUTUBE":
-                res = self.post_to_youtube_shorts(video_url, defaults['yt'], defaults['yt'])
-            elif p_upper == "FACEBOOK":
-                res = self.post_to_facebook_video(video_url, defaults['fb'])
-            else:
-                logger.warning(f"Unknown platform: {platform}")
-                res = {"status": "SKIPPED", "message": "Unknown platform"}
-            
-            if 'platform' not in res: res['platform'] = p_upper
-            results.append(res)
+            for platform in platforms:
+                p_upper = platform.upper()
+                if platform not in futures:
+                    results.append(state[p_upper])
+                    continue
+                try:
+                    res = futures[platform].result()
+                except Exception as e:
+                    logger.error(f"Post to {platform} raised: {e}", exc_info=True)
+                    res = {"status": "ERROR", "message": str(e)}
+                if 'platform' not in res: res['platform'] = p_upper
+                state[p_upper] = res
+                results.append(res)
 
         logger.info(f"Multi-platform post completed with {len(results)} results")
         return results
+
+    def _post_clip_to_platform(self, platform: str, video_url: str, captions: dict, prev: dict = None) -> dict:
+        """Dispatch a single clip post to one platform (runs on a worker thread)."""
+        p_upper = platform.upper()
+        logger.debug(f"Processing platform: {p_upper}")
+
+        fn = self._clip_dispatch.get(p_upper)
+        if fn is None:
+            logger.warning(f"Unknown platform: {platform}")
+            return {"status": "SKIPPED", "message": "Unknown platform"}
+        return fn(video_url, captions, prev or {})
+
+
+# Module-level singleton: the YouTube token cache, connection pool and rate
+# buckets only pay off if every caller shares one AutoPoster instead of
+# constructing a fresh one per post.
+_INSTANCE = None
+_INSTANCE_LOCK = threading.Lock()
+
+
+def get_auto_poster() -> AutoPoster:
+    """Return the shared AutoPoster, building it on first use."""
+    global _INSTANCE
+    if _INSTANCE is None:
+        with _INSTANCE_LOCK:
+            if _INSTANCE is None:
+                _INSTANCE = AutoPoster()
+    return _INSTANCE
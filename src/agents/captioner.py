@@ -1,17 +1,32 @@
 
+import json
 import logging
-from openai import OpenAI
+import threading
+import time
+from collections import OrderedDict
 from src.config import settings
+from src.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+# One client for every CaptionAgent — keeps the underlying httpx
+# connection (and its TLS session) alive across instances
+_CLIENT = get_openai_client()
+
+# Small TTL cache: retries and re-runs frequently ask for the same
+# transcript + tone, and with temperature=0 the answer is stable
+_CACHE_MAX = 512
+_CACHE_TTL = 3600.0
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
 class CaptionAgent:
     """
     Agent #4: Generates Haryanvi/Hinglish captions for social media.
     """
-    
+
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = _CLIENT
 
     def generate_caption(self, text: str, tone: str = "Attitude") -> dict:
         """
@@ -20,6 +35,14 @@ class CaptionAgent:
         if not settings.openai_api_key:
             return {"ig": "System offline", "yt": "#Error"}
 
+        cache_key = (hash(text), tone)
+        now = time.monotonic()
+        with _cache_lock:
+            hit = _cache.get(cache_key)
+            if hit and now - hit[0] < _CACHE_TTL:
+                _cache.move_to_end(cache_key)
+                return dict(hit[1])
+
         prompt = (
             f"Context: {text}\n"
             f"Tone: {tone} (Haryanvi Style)\n"
@@ -34,10 +57,16 @@ class CaptionAgent:
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": prompt}],
-                response_format={ "type": "json_object" }
+                response_format={ "type": "json_object" },
+                temperature=0
             )
-            import json
-            return json.loads(response.choices[0].message.content)
+            captions = json.loads(response.choices[0].message.content)
+            with _cache_lock:
+                _cache[cache_key] = (now, captions)
+                _cache.move_to_end(cache_key)
+                while len(_cache) > _CACHE_MAX:
+                    _cache.popitem(last=False)
+            return captions
         except Exception as e:
             logger.error(f"Captioning failed: {e}")
             return {"ig": f"Check this out! #Viral", "yt": "New Video out now!"}
@@ -1,17 +1,28 @@
 
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
 import cv2
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=32)
+def _load_font(path, size):
+    """Parse the .ttf once per (path, size) — posters reuse the same font."""
+    try:
+        return ImageFont.truetype(path, size=size)
+    except Exception:
+        return ImageFont.load_default()
+
 class FramePowerAgent:
     """
-    Agent #3: Responsible for extracting high-impact frames and 
+    Agent #3: Responsible for extracting high-impact frames and
     generating posters with text overlays.
     """
-    
+
     def __init__(self, font_path="arial.ttf"):
         # We try to use a bold system font
         self.font_path = font_path
@@ -19,29 +30,87 @@ class FramePowerAgent:
     def create_viral_poster(self, frame_path: str, text: str, output_path: str):
         """
         Takes a frame and adds bold text overlay.
+
+        Drawn with OpenCV: putText is a single C call and imwrite encodes
+        through libjpeg-turbo, which is several times faster than the old
+        PIL draw + save path. PIL remains the path for formats cv2.imread
+        cannot decode and for non-ASCII text — Hershey fonts are
+        ASCII-only, so Devanagari/Hinglish titles would render as ??.
         """
         try:
-            img = Image.open(frame_path)
-            draw = ImageDraw.Draw(img)
-            width, height = img.size
-            
-            # Position text at the bottom third
-            try:
-                font = ImageFont.truetype(self.font_path, size=int(height * 0.08))
-            except:
-                font = ImageFont.load_default()
-
-            # Text Shadow/Outline for visibility
+            if not text.isascii():
+                return self._create_poster_pil(frame_path, text, output_path)
+
+            img = cv2.imread(frame_path, cv2.IMREAD_COLOR)
+            if img is None:
+                return self._create_poster_pil(frame_path, text, output_path)
+
+            height, width = img.shape[:2]
+
+            # Position text at the bottom third, scaled to frame height
+            scale = height * 0.08 / 25.0
+            thickness = max(2, int(round(scale * 2)))
             text_pos = (width // 10, height - (height // 3))
-            
+
             # Draw shadow
-            draw.text((text_pos[0]+5, text_pos[1]+5), text, font=font, fill="black")
+            cv2.putText(img, text, (text_pos[0] + 5, text_pos[1] + 5),
+                        cv2.FONT_HERSHEY_DUPLEX, scale, (0, 0, 0),
+                        thickness + 2, cv2.LINE_AA)
             # Draw primary text (Yellow is very popular in Haryanvi thumbnails)
-            draw.text(text_pos, text, font=font, fill="#FFD700")
+            cv2.putText(img, text, text_pos,
+                        cv2.FONT_HERSHEY_DUPLEX, scale, (0, 215, 255),
+                        thickness, cv2.LINE_AA)
 
-            img.save(output_path, quality=95)
+            cv2.imwrite(output_path, img,
+                        [cv2.IMWRITE_JPEG_QUALITY, 95, cv2.IMWRITE_JPEG_OPTIMIZE, 1])
             logger.info(f"Poster created: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Poster generation failed: {e}")
             return None
+
+    def _create_poster_pil(self, frame_path: str, text: str, output_path: str):
+        """Original PIL path, kept for frames OpenCV cannot read."""
+        img = Image.open(frame_path)
+        draw = ImageDraw.Draw(img)
+        width, height = img.size
+
+        # Position text at the bottom third
+        font = _load_font(self.font_path, int(height * 0.08))
+
+        # Text Shadow/Outline for visibility
+        text_pos = (width // 10, height - (height // 3))
+
+        # Draw shadow
+        draw.text((text_pos[0]+5, text_pos[1]+5), text, font=font, fill="black")
+        # Draw primary text (Yellow is very popular in Haryanvi thumbnails)
+        draw.text(text_pos, text, font=font, fill="#FFD700")
+
+        img.save(output_path, quality=95)
+        logger.info(f"Poster created: {output_path}")
+        return output_path
+
+    def create_viral_posters(self, jobs):
+        """
+        Batch variant: jobs is a list of (frame_path, text, output_path)
+        tuples. Poster drawing and JPEG encoding are CPU-bound, so the
+        batch fans out across a process pool and scales with core count.
+        Returns output paths in input order (None where a job failed).
+        """
+        if not jobs:
+            return []
+        if len(jobs) == 1:
+            frame_path, text, output_path = jobs[0]
+            return [self.create_viral_poster(frame_path, text, output_path)]
+
+        work = [(f, t, o, self.font_path) for f, t, o in jobs]
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(work))) as pool:
+            return list(pool.map(_poster_worker, work))
+
+
+def _poster_worker(job):
+    """Module-level so ProcessPoolExecutor can pickle it."""
+    frame_path, text, output_path, font_path = job
+    return FramePowerAgent(font_path=font_path).create_viral_poster(
+        frame_path, text, output_path
+    )
@@ -1,20 +1,182 @@
 
+import asyncio
+import hashlib
 import json
 import logging
-from openai import OpenAI
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import httpx
+from openai import AsyncOpenAI
+from sqlalchemy import func, select
+from sqlalchemy.orm import raiseload, selectinload
+
 from src.config import settings
+from src.database import SessionLocal
+from src.enums import PIPELINE_STEP_NAMES
+from src.models import ContentAsset, Post, WhatsAppMessage
+from src.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+__all__ = ["OpenAIBrain"]
+
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+except ImportError:
+    # orjson is optional — stdlib json works everywhere, just slower, and
+    # compact separators + raw Unicode keep the tool payloads (and the
+    # tokens billed for them) small
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+# Short-TTL cache for tool-free replies: users re-ask the same "kya chal
+# raha hai" style questions and each one costs a 1-3s GPT-4o round-trip.
+# Responses that needed tools are never cached — they reflect live state.
+# One async HTTP pool for every brain instance, with bounded connections,
+# and a semaphore so fan-out cannot slam the OpenAI rate limits into a
+# 429 storm. Eight matches the Whisper cap below.
+_ASYNC_HTTP = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    timeout=60,
+)
+_OPENAI_SEM = asyncio.Semaphore(8)
+
+_RESPONSE_CACHE_MAX = 512
+_RESPONSE_TTL = 300.0
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+
+def _select_relevant_history(history, user_message, keep=5):
+    """Picks the `keep` most relevant past exchanges for the prompt.
+
+    Word-overlap scoring against the new message, with recency as the
+    tiebreak and a plain latest-5 fallback when nothing overlaps. Cheap
+    stand-in for embedding retrieval — close context for fewer input
+    tokens without a vector store.
+    """
+    if len(history) <= keep:
+        return history
+
+    query_words = set(user_message.lower().split())
+    scored = []
+    for pos, msg in enumerate(history):
+        text = f"{msg.message or ''} {msg.response or ''}".lower()
+        overlap = len(query_words & set(text.split()))
+        scored.append((overlap, pos, msg))
+
+    if not any(score for score, _, _ in scored):
+        return history[-keep:]
+
+    # Highest overlap wins, later position breaks ties; re-sort the
+    # survivors back into chronological order for the prompt
+    top = sorted(scored, key=lambda t: (t[0], t[1]), reverse=True)[:keep]
+    return [msg for _, _, msg in sorted(top, key=lambda t: t[1])]
+
+
+@lru_cache(maxsize=2)
+def _render_system_prompt(template, date_str):
+    """The rendered prompt only changes at midnight; two slots cover the
+    rollover moment where both dates are briefly in flight."""
+    return {"role": "system", "content": template.format(today_date=date_str)}
+
+
+_calendar_agent = None
+
+
+def _get_calendar_agent():
+    """Memoized CalendarAgent — imported lazily so chat turns that never
+    touch the calendar skip loading the Google client libraries."""
+    global _calendar_agent
+    if _calendar_agent is None:
+        from src.agents.calendar_agent import CalendarAgent
+        _calendar_agent = CalendarAgent()
+    return _calendar_agent
+
+
+def _response_key(user_message, sender):
+    normalized = f"{sender}|{user_message.lower().strip()}"
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def _cached_response(key):
+    with _response_cache_lock:
+        hit = _response_cache.get(key)
+        if hit and time.monotonic() - hit[0] < _RESPONSE_TTL:
+            _response_cache.move_to_end(key)
+            return hit[1]
+    return None
+
+
+def _remember_response(key, text):
+    with _response_cache_lock:
+        _response_cache[key] = (time.monotonic(), text)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _RESPONSE_CACHE_MAX:
+            _response_cache.popitem(last=False)
+
+
+class _ToolCall:
+    """A tool call assembled from streaming deltas, shaped like the SDK object."""
+    class _Function:
+        def __init__(self, name, arguments):
+            self.name = name
+            self.arguments = arguments
+
+    def __init__(self, call_id, name, arguments):
+        self.id = call_id
+        self.function = self._Function(name, arguments)
+
+
 class OpenAIBrain:
     """
     Agent #13: The Personality & Voice of Biru Bhai.
     Handles general chat, voice notes, and now SYSTEM TOOLS.
     """
+    # Built once on first init and shared by every instance — the schema
+    # never changes, so per-instance copies were pure allocation churn
+    _TOOLS_SCHEMA = None
+
     def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+        self.client = get_openai_client()
+        self.aclient = AsyncOpenAI(api_key=settings.openai_api_key, http_client=_ASYNC_HTTP)
+        # The tools schema and the system prompt never change per request;
+        # build them once instead of reallocating the dicts on every chat
+        if OpenAIBrain._TOOLS_SCHEMA is None:
+            OpenAIBrain._TOOLS_SCHEMA = self._build_tools()
+        self._tools = OpenAIBrain._TOOLS_SCHEMA
+        self._system_prompt_template = (
+            "You are Goga Bhai, a wealthy, alpha, yet helpful Solo Creator from Haryana. "
+            "Today is {today_date}. "
+            "You are the master of your craft. You speak a mix of Hindi, English, and Haryanvi. "
+            "Personality: Confident, alpha, extremely protective of 'Bhai' (the user). "
+            "Key phrases: 'Main hoon na, tension mat le', 'System paad denge', 'Bhai hai tu mera'. "
+            "You have access to TOOLS to check system status, list assets, check pipeline, and MANAGE THE CALENDAR (View, Add, Edit, Cancel). "
+            "IMPORTANT INSTRUCTIONS: "
+            "1. BEFORE creating any event, ALWAYS call 'list_upcoming_events' first to check for conflicts or duplicates. If a similar event exists, ask the user if they still want to proceed. "
+            "2. If user asks 'Kab free hu?' or 'When am I free?', use 'list_upcoming_events' to see what's booked, then tell them the gaps. "
+            "3. When creating an event, if no email is provided, assume the user's email is '7.casanov.7@gmail.com' and add it to attendees if valid. "
+            "4. Only ask for details if Title or Time is strictly missing. For Location, default to 'Online' or 'Office'. For Attendees, just use the user's email if none given. "
+            "5. If user wants to Edit/Reschedule -> Call 'update_event'. "
+            "6. If user wants to Cancel -> Call 'cancel_event'. "
+            "7. If user asks to Post -> You MUST explain you need the media file first unless they sent one. "
+            "Keep responses short, impactful, and full of raw Haryana energy. No 'AI' talk."
+        )
 
-    def _get_tools(self):
+    def _build_tools(self):
         return [
             {
                 "type": "function",
@@ -143,125 +305,174 @@ class OpenAIBrain:
             }
         ]
 
-    def _execute_tool(self, tool_call):
-        from src.database import SessionLocal
-        from src.models import ContentAsset, Clip, WhatsAppMessage
-        from src.enums import PIPELINE_STEP_NAMES
-        
-        name = tool_call.function.name
-        args = json.loads(tool_call.function.arguments)
-        db = SessionLocal()
-        
-        try:
-            if name == "get_system_status":
-                assets_count = db.query(ContentAsset).count()
-                ready_count = db.query(ContentAsset).filter(ContentAsset.status == "READY").count()
-                wa_logs_count = db.query(WhatsAppMessage).count()
-                return {
-                    "status": "ONLINE",
-                    "total_assets": assets_count,
-                    "ready_assets": ready_count,
-                    "whatsapp_logs_total": wa_logs_count,
-                    "brain": "GPT-4o Agentic"
-                }
-                
-            elif name == "list_recent_content":
-                limit = args.get("limit", 5)
-                assets = db.query(ContentAsset).order_by(ContentAsset.created_at.desc()).limit(limit).all()
-                return [{
-                    "id": a.id, "title": a.title, "status": a.status, 
-                    "step": PIPELINE_STEP_NAMES.get(a.pipeline_step, "Unknown"),
-                    "created": a.created_at.strftime("%Y-%m-%d %H:%M")
-                } for a in assets]
-                
-            elif name == "get_asset_pipeline_details":
-                asset_id = args.get("asset_id")
-                asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
-                if not asset: return {"error": "Asset not found"}
-                
-                return {
-                    "id": asset.id,
-                    "title": asset.title,
-                    "current_step": PIPELINE_STEP_NAMES.get(asset.pipeline_step),
-                    "step_status": asset.pipeline_step_status,
-                    "meta": asset.meta_data,
-                    "error": asset.error_message
-                }
-                
-            elif name == "list_recent_messages":
-                limit = args.get("limit", 5)
-                msgs = db.query(WhatsAppMessage).order_by(WhatsAppMessage.timestamp.desc()).limit(limit).all()
-                return [{
-                    "from": m.sender, "msg": m.message, "reply": m.response,
-                    "time": m.timestamp.strftime("%H:%M")
-                } for m in msgs]
-                
-            elif name == "list_recent_posts":
-                from src.models import Post
-                limit = args.get("limit", 5)
-                posts = db.query(Post).order_by(Post.created_at.desc()).limit(limit).all()
-                return [{
-                    "platform": p.platform, "status": p.status, 
-                    "url": p.post_url, "time": p.created_at.strftime("%Y-%m-%d %H:%M")
-                } for p in posts]
-
-            elif name == "create_event":
-                from src.agents.calendar_agent import CalendarAgent
-                cal = CalendarAgent()
-                return cal.create_event(
-                    title=args.get("title"),
-                    start_time=args.get("start_time"),
-                    description=args.get("description", ""),
-                    event_type=args.get("event_type", "MEETING"),
-                    location=args.get("location"),
-                    attendees=args.get("attendees")
-                )
+    # ------------------------------------------------------------------
+    # Tool handlers — one method per tool name, dispatched via _TOOL_HANDLERS
+    # ------------------------------------------------------------------
 
-            elif name == "list_upcoming_events":
-                from src.agents.calendar_agent import CalendarAgent
-                cal = CalendarAgent()
-                return cal.list_events(limit=args.get("limit", 5))
-
-            elif name == "update_event":
-                from src.agents.calendar_agent import CalendarAgent
-                cal = CalendarAgent()
-                return cal.update_event(
-                    event_id=str(args.get("event_id")),
-                    title=args.get("title"),
-                    location=args.get("location"),
-                    description=args.get("description"),
-                    # start_time logic is complex due to end_time requirement in Google API update,
-                    # but our simplified update_event handles basic fields.
-                    # If start_time is passed, it might fail if end_time isn't handled in update_event (which I didn't fully implement for Google)
-                    # But for now, let's allow it.
-                )
+    # get_system_status answers change slowly; 30s of staleness is fine
+    # for a chat reply and makes repeat status calls free
+    _STATUS_TTL = 30.0
+    _status_cache = (0.0, None)
+    _status_lock = threading.Lock()
 
-            elif name == "cancel_event":
-                from src.agents.calendar_agent import CalendarAgent
-                cal = CalendarAgent()
-                return cal.cancel_event(event_id=str(args.get("event_id")))
+    def _tool_get_system_status(self, db, args):
+        with self._status_lock:
+            stamp, cached = OpenAIBrain._status_cache
+            if cached is not None and time.monotonic() - stamp < self._STATUS_TTL:
+                return cached
 
-        finally:
-            db.close()
+        # All three counters in one round-trip as labelled scalar
+        # subqueries — no FROM clause on the outer SELECT, so each count
+        # stands alone and adding another table later is a one-liner
+        row = db.execute(
+            select(
+                select(func.count()).select_from(ContentAsset)
+                .scalar_subquery().label("total"),
+                select(func.count()).select_from(ContentAsset)
+                .where(ContentAsset.status == "READY")
+                .scalar_subquery().label("ready"),
+                select(func.count()).select_from(WhatsAppMessage)
+                .scalar_subquery().label("wa"),
+            )
+        ).one()
+        assets_count, ready_count, wa_logs_count = row.total, row.ready, row.wa
+        status = {
+            "status": "ONLINE",
+            "total_assets": assets_count,
+            "ready_assets": int(ready_count),
+            "whatsapp_logs_total": wa_logs_count,
+            "brain": "GPT-4o Agentic"
+        }
+        with self._status_lock:
+            OpenAIBrain._status_cache = (time.monotonic(), status)
+        return status
 
-    def chat_response(self, user_message: str, sender: str = None) -> str:
-        """Generates a witty Biru Bhai style response, using tools if needed. Can include context from 'sender' history."""
+    def _tool_list_recent_content(self, db, args):
+        limit = args.get("limit", 5)
+        # Column projection skips ORM object hydration for the listing
+        rows = db.query(
+            ContentAsset.id, ContentAsset.title, ContentAsset.status,
+            ContentAsset.pipeline_step, ContentAsset.created_at
+        ).order_by(ContentAsset.created_at.desc()).limit(limit).all()
+        _names = PIPELINE_STEP_NAMES
+        return [{
+            "id": r.id, "title": r.title, "status": r.status,
+            "step": _names.get(r.pipeline_step, "Unknown"),
+            "created": r.created_at.strftime("%Y-%m-%d %H:%M")
+        } for r in rows]
+
+    def _tool_get_asset_pipeline_details(self, db, args):
+        asset_id = args.get("asset_id")
+        # Clips come along in one extra SELECT; raiseload turns any other
+        # accidental lazy access into a loud error instead of a hidden N+1
+        asset = db.query(ContentAsset).options(
+            selectinload(ContentAsset.clips), raiseload('*')
+        ).filter(ContentAsset.id == asset_id).first()
+        if not asset: return {"error": "Asset not found"}
+
+        return {
+            "id": asset.id,
+            "title": asset.title,
+            "current_step": PIPELINE_STEP_NAMES.get(asset.pipeline_step),
+            "step_status": asset.pipeline_step_status,
+            "clips": len(asset.clips),
+            "meta": asset.meta_data,
+            "error": asset.error_message
+        }
+
+    def _tool_list_recent_messages(self, db, args):
+        limit = args.get("limit", 5)
+        rows = db.query(
+            WhatsAppMessage.sender, WhatsAppMessage.message,
+            WhatsAppMessage.response, WhatsAppMessage.timestamp
+        ).order_by(WhatsAppMessage.timestamp.desc()).limit(limit).all()
+        return [{
+            "from": r.sender, "msg": r.message, "reply": r.response,
+            "time": r.timestamp.strftime("%H:%M")
+        } for r in rows]
+
+    def _tool_list_recent_posts(self, db, args):
+        limit = args.get("limit", 5)
+        rows = db.query(
+            Post.platform, Post.status, Post.post_url, Post.created_at
+        ).order_by(Post.created_at.desc()).limit(limit).all()
+        return [{
+            "platform": r.platform, "status": r.status,
+            "url": r.post_url, "time": r.created_at.strftime("%Y-%m-%d %H:%M")
+        } for r in rows]
+
+    def _tool_create_event(self, db, args):
+        return _get_calendar_agent().create_event(
+            title=args.get("title"),
+            start_time=args.get("start_time"),
+            description=args.get("description", ""),
+            event_type=args.get("event_type", "MEETING"),
+            location=args.get("location"),
+            attendees=args.get("attendees")
+        )
+
+    def _tool_list_upcoming_events(self, db, args):
+        return _get_calendar_agent().list_events(limit=args.get("limit", 5))
+
+    def _tool_update_event(self, db, args):
+        return _get_calendar_agent().update_event(
+            event_id=str(args.get("event_id")),
+            title=args.get("title"),
+            location=args.get("location"),
+            description=args.get("description"),
+            # start_time logic is complex due to end_time requirement in Google API update,
+            # but our simplified update_event handles basic fields.
+        )
+
+    def _tool_cancel_event(self, db, args):
+        return _get_calendar_agent().cancel_event(event_id=str(args.get("event_id")))
+
+    _TOOL_HANDLERS = {
+        "get_system_status": _tool_get_system_status,
+        "list_recent_content": _tool_list_recent_content,
+        "get_asset_pipeline_details": _tool_get_asset_pipeline_details,
+        "list_recent_messages": _tool_list_recent_messages,
+        "list_recent_posts": _tool_list_recent_posts,
+        "create_event": _tool_create_event,
+        "list_upcoming_events": _tool_list_upcoming_events,
+        "update_event": _tool_update_event,
+        "cancel_event": _tool_cancel_event,
+    }
+
+    def _execute_tool(self, tool_call, db=None):
+        name = tool_call.function.name
+        args = _json_loads(tool_call.function.arguments)
+        handler = self._TOOL_HANDLERS.get(name)
+        if handler is None:
+            return None
+
+        # A caller holding a session can inject it; otherwise open one just
+        # for this tool. Concurrent tool fan-out must NOT share a session —
+        # SQLAlchemy sessions are single-threaded — which is why the
+        # parallel paths call this without db.
+        if db is not None:
+            return handler(self, db, args)
+        with SessionLocal() as db:
+            return handler(self, db, args)
+
+    def _build_messages(self, user_message: str, sender: str = None) -> list:
+        """Assembles system prompt + sender history + the new user message."""
         from datetime import datetime
-        from src.database import SessionLocal
-        from src.models import WhatsAppMessage
-        
+
         today_date = datetime.now().strftime("%d %b %Y, %A")
-        
+
         # Build context from DB if sender is known
         context_messages = []
         if sender:
-            db = SessionLocal()
             try:
-                # Fetch last 5 interactions (excluding current pending one)
-                # We skip the most recent one (offset 1) because it is the current message we are processing.
-                history = db.query(WhatsAppMessage).filter(WhatsAppMessage.sender == sender).order_by(WhatsAppMessage.timestamp.desc()).offset(1).limit(5).all()
-                history.reverse()
-                
+                with SessionLocal() as db:
+                    # Fetch a wider indexed window and drop the newest row —
+                    # that is the current message being processed
+                    history = db.query(WhatsAppMessage).filter(WhatsAppMessage.sender == sender).order_by(WhatsAppMessage.timestamp.desc()).limit(26).all()
+                    history = history[1:]
+                    history.reverse()
+
+                history = _select_relevant_history(history, user_message)
                 for msg in history:
                     if msg.message:
                         context_messages.append({"role": "user", "content": msg.message})
@@ -269,73 +480,279 @@ class OpenAIBrain:
                         context_messages.append({"role": "assistant", "content": msg.response})
             except Exception as e:
                 logger.error(f"Failed to fetch context: {e}")
-            finally:
-                db.close()
+
+        # System Prompt — rendered once per day, not per message
+        system_prompt = _render_system_prompt(self._system_prompt_template, today_date)
+        return [system_prompt] + context_messages + [{"role": "user", "content": user_message}]
+
+    def chat_response(self, user_message: str, sender: str = None) -> str:
+        """Generates a witty Biru Bhai style response, using tools if needed. Can include context from 'sender' history."""
+        cache_key = _response_key(user_message, sender)
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            # System Prompt
-            system_prompt = {
-                "role": "system", 
-                "content": (
-                    f"You are Goga Bhai, a wealthy, alpha, yet helpful Solo Creator from Haryana. "
-                    f"Today is {today_date}. "
-                    "You are the master of your craft. You speak a mix of Hindi, English, and Haryanvi. "
-                    "Personality: Confident, alpha, extremely protective of 'Bhai' (the user). "
-                    "Key phrases: 'Main hoon na, tension mat le', 'System paad denge', 'Bhai hai tu mera'. "
-                    "You have access to TOOLS to check system status, list assets, check pipeline, and MANAGE THE CALENDAR (View, Add, Edit, Cancel). "
-                    "IMPORTANT INSTRUCTIONS: "
-                    "1. BEFORE creating any event, ALWAYS call 'list_upcoming_events' first to check for conflicts or duplicates. If a similar event exists, ask the user if they still want to proceed. "
-                    "2. If user asks 'Kab free hu?' or 'When am I free?', use 'list_upcoming_events' to see what's booked, then tell them the gaps. "
-                    "3. When creating an event, if no email is provided, assume the user's email is '7.casanov.7@gmail.com' and add it to attendees if valid. "
-                    "4. Only ask for details if Title or Time is strictly missing. For Location, default to 'Online' or 'Office'. For Attendees, just use the user's email if none given. "
-                    "5. If user wants to Edit/Reschedule -> Call 'update_event'. "
-                    "6. If user wants to Cancel -> Call 'cancel_event'. "
-                    "7. If user asks to Post -> You MUST explain you need the media file first unless they sent one. "
-                    "Keep responses short, impactful, and full of raw Haryana energy. No 'AI' talk."
-                )
-            }
-            
-            messages = [system_prompt] + context_messages + [{"role": "user", "content": user_message}]
+            messages = self._build_messages(user_message, sender)
             
-            response = self.client.chat.completions.create(
+            # Stream the first completion so tool calls can start executing
+            # as soon as their argument deltas finish, instead of waiting
+            # for the whole response to land.
+            stream = self.client.chat.completions.create(
                 model="gpt-4o",
                 messages=messages,
-                tools=self._get_tools(),
-                tool_choice="auto"
+                tools=self._tools,
+                tool_choice="auto",
+                stream=True
             )
-            
-            # Handle tool calls
-            tool_calls = response.choices[0].message.tool_calls
+
+            text_parts = []
+            tool_calls = []
+            futures = {}
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                for chunk in stream:
+                    delta = chunk.choices[0].delta if chunk.choices else None
+                    if delta is None:
+                        continue
+                    if delta.content:
+                        text_parts.append(delta.content)
+                    for tc_delta in delta.tool_calls or []:
+                        # A new index means the previous tool call is fully
+                        # assembled — kick it off while the stream continues
+                        if tc_delta.index >= len(tool_calls):
+                            if tool_calls:
+                                prev = tool_calls[-1]
+                                futures[prev.id] = pool.submit(self._execute_tool, prev)
+                            tool_calls.append(_ToolCall(
+                                tc_delta.id,
+                                tc_delta.function.name,
+                                tc_delta.function.arguments or ""
+                            ))
+                        elif tc_delta.function.arguments:
+                            tool_calls[tc_delta.index].function.arguments += tc_delta.function.arguments
+                if tool_calls:
+                    last = tool_calls[-1]
+                    futures[last.id] = pool.submit(self._execute_tool, last)
+
+            if not tool_calls:
+                reply = "".join(text_parts)
+                _remember_response(cache_key, reply)
+                return reply
+
+            messages.append({
+                "role": "assistant",
+                "content": "".join(text_parts) or None,
+                "tool_calls": [{
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+                } for tc in tool_calls]
+            })
+            for tool_call in tool_calls:
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": tool_call.function.name,
+                    "content": _json_dumps(futures[tool_call.id].result())
+                })
+
+            # Final response after tool execution, streamed and joined —
+            # callers deliver one WhatsApp message, so we still return str
+            final_stream = self.client.chat.completions.create(
+                model="gpt-4o",
+                messages=messages,
+                stream=True
+            )
+            return "".join(
+                chunk.choices[0].delta.content
+                for chunk in final_stream
+                if chunk.choices and chunk.choices[0].delta.content
+            )
+        except Exception as e:
+            logger.error(f"OpenAI Chat Failed: {e}")
+            return "Bhai, dimaag thoda garam hai abhi. System check kar raha hoon ruk."
+
+    async def achat_response(self, user_message: str, sender: str = None) -> str:
+        """Async chat_response: non-blocking completions, tool fan-out via gather.
+
+        DB-backed pieces (history fetch, tool handlers) stay synchronous and
+        run on worker threads so the event loop is never blocked.
+        """
+        cache_key = _response_key(user_message, sender)
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            messages = await asyncio.to_thread(self._build_messages, user_message, sender)
+
+            # Stream the first completion and launch each tool the moment
+            # its argument deltas finish, mirroring the sync path
+            async with _OPENAI_SEM:
+                stream = await self.aclient.chat.completions.create(
+                    model="gpt-4o",
+                    messages=messages,
+                    tools=self._tools,
+                    tool_choice="auto",
+                    stream=True
+                )
+
+            text_parts = []
+            tool_calls = []
+            tasks = {}
+            async for chunk in stream:
+                delta = chunk.choices[0].delta if chunk.choices else None
+                if delta is None:
+                    continue
+                if delta.content:
+                    text_parts.append(delta.content)
+                for tc_delta in delta.tool_calls or []:
+                    if tc_delta.index >= len(tool_calls):
+                        if tool_calls:
+                            prev = tool_calls[-1]
+                            tasks[prev.id] = asyncio.create_task(
+                                asyncio.to_thread(self._execute_tool, prev))
+                        tool_calls.append(_ToolCall(
+                            tc_delta.id,
+                            tc_delta.function.name,
+                            tc_delta.function.arguments or ""
+                        ))
+                    elif tc_delta.function.arguments:
+                        tool_calls[tc_delta.index].function.arguments += tc_delta.function.arguments
             if tool_calls:
-                messages.append(response.choices[0].message)
-                for tool_call in tool_calls:
-                    result = self._execute_tool(tool_call)
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "name": tool_call.function.name,
-                        "content": json.dumps(result)
-                    })
-                
-                # Final response after tool execution
-                final_response = self.client.chat.completions.create(
+                last = tool_calls[-1]
+                tasks[last.id] = asyncio.create_task(
+                    asyncio.to_thread(self._execute_tool, last))
+
+            if not tool_calls:
+                reply = "".join(text_parts)
+                _remember_response(cache_key, reply)
+                return reply
+
+            messages.append({
+                "role": "assistant",
+                "content": "".join(text_parts) or None,
+                "tool_calls": [{
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+                } for tc in tool_calls]
+            })
+            for tool_call in tool_calls:
+                messages.append({
+                    "role": "tool",
+                    "tool_call_id": tool_call.id,
+                    "name": tool_call.function.name,
+                    "content": _json_dumps(await tasks[tool_call.id])
+                })
+
+            async with _OPENAI_SEM:
+                final_stream = await self.aclient.chat.completions.create(
                     model="gpt-4o",
-                    messages=messages
+                    messages=messages,
+                    stream=True
                 )
-                return final_response.choices[0].message.content
-                
-            return response.choices[0].message.content
+            return "".join([
+                chunk.choices[0].delta.content
+                async for chunk in final_stream
+                if chunk.choices and chunk.choices[0].delta.content
+            ])
         except Exception as e:
             logger.error(f"OpenAI Chat Failed: {e}")
             return "Bhai, dimaag thoda garam hai abhi. System check kar raha hoon ruk."
 
+    _AUDIO_MIME = {
+        ".ogg": "audio/ogg", ".oga": "audio/ogg", ".opus": "audio/ogg",
+        ".wav": "audio/wav", ".m4a": "audio/mp4", ".mp4": "audio/mp4",
+        ".webm": "audio/webm",
+    }
+
+    # ------------------------------------------------------------------
+    # Batch API — for nightly bulk jobs (log summaries, re-processing),
+    # where ~50% cheaper throughput beats interactive latency
+    # ------------------------------------------------------------------
+
+    def submit_batch(self, requests, endpoint="/v1/chat/completions",
+                     completion_window="24h"):
+        """Submits an iterable of request bodies to the OpenAI Batch API.
+
+        Each item is the JSON body a normal call would send (model,
+        messages, ...). Returns the batch id, or None on failure.
+        """
+        import io
+        try:
+            buf = io.BytesIO()
+            for i, body in enumerate(requests):
+                line = {
+                    "custom_id": f"req-{i}",
+                    "method": "POST",
+                    "url": endpoint,
+                    "body": body,
+                }
+                buf.write(json.dumps(line, ensure_ascii=False).encode("utf-8"))
+                buf.write(b"\n")
+            buf.seek(0)
+            batch_file = self.client.files.create(file=("batch.jsonl", buf), purpose="batch")
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint=endpoint,
+                completion_window=completion_window,
+            )
+            logger.info(f"Batch submitted: {batch.id}")
+            return batch.id
+        except Exception as e:
+            logger.error(f"Batch submit failed: {e}")
+            return None
+
+    def get_batch_results(self, batch_id):
+        """Returns parsed results once the batch completes, else None.
+
+        Callers poll this from a background task — the 24h window makes
+        blocking on it pointless.
+        """
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status != "completed":
+                if batch.status in ("failed", "expired", "cancelled"):
+                    logger.error(f"Batch {batch_id} ended as {batch.status}")
+                return None
+            raw = self.client.files.content(batch.output_file_id).content
+            return [json.loads(line) for line in raw.splitlines() if line.strip()]
+        except Exception as e:
+            logger.error(f"Batch retrieve failed: {e}")
+            return None
+
+    # At most 8 voice notes in flight — keeps a burst of notes from
+    # saturating the connection pool or the Whisper rate limit
+    _WHISPER_SEM = asyncio.Semaphore(8)
+
+    async def atranscribe_audio(self, audio_file_path: str) -> str:
+        """Async Whisper transcription; overlaps concurrent voice notes."""
+        try:
+            name = os.path.basename(audio_file_path)
+            mime = self._AUDIO_MIME.get(os.path.splitext(name)[1].lower(), "audio/mpeg")
+            async with self._WHISPER_SEM:
+                with open(audio_file_path, "rb") as audio_file:
+                    transcript = await self.aclient.audio.transcriptions.create(
+                        model="whisper-1",
+                        file=(name, audio_file, mime)
+                    )
+            return transcript.text
+        except Exception as e:
+            logger.error(f"Whisper Transcription Failed: {e}")
+            return ""
+
     def transcribe_audio(self, audio_file_path: str) -> str:
         """Transcribes a voice note using Whisper."""
         try:
+            name = os.path.basename(audio_file_path)
+            mime = self._AUDIO_MIME.get(os.path.splitext(name)[1].lower(), "audio/mpeg")
             with open(audio_file_path, "rb") as audio_file:
+                # (name, handle, mime) tuple lets the multipart body stream
+                # from disk instead of buffering the whole note in memory
                 transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio_file
+                    model="whisper-1",
+                    file=(name, audio_file, mime)
                 )
             return transcript.text
         except Exception as e:
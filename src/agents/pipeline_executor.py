@@ -1,13 +1,18 @@
 import os
 import json
 import logging
+import shutil
+import subprocess
 import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from openai import OpenAI
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import flag_modified
 
 from src.config import settings
-from src.models import ContentAsset, Clip, Post
+from src.openai_client import get_openai_client
+from src.models import ContentAsset, Clip, PipelineStepResult, Post
 from src.enums import ContentStatus, ClipStatus, PostStatus, Platform
 
 logger = logging.getLogger(__name__)
@@ -18,6 +23,59 @@ except ImportError:
     logger.warning("yt_dlp not installed - video operations will fail")
     yt_dlp = None
 
+try:
+    import tiktoken
+    _gpt4o_encoding = tiktoken.encoding_for_model("gpt-4o")
+
+    def _truncate_tokens(text: str, max_tokens: int) -> str:
+        tokens = _gpt4o_encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return _gpt4o_encoding.decode(tokens[:max_tokens])
+except ImportError:
+    # tiktoken is optional — the char cut is a rough stand-in (Devanagari
+    # runs far fewer chars per token than English, so this under-fills)
+    def _truncate_tokens(text: str, max_tokens: int) -> str:
+        return text[:max_tokens * 2]
+
+
+# Structured-output schema for step 3. Passing the shape here instead of
+# as a JSON example in the prompt saves a couple hundred prompt tokens per
+# call and makes malformed-JSON retries impossible — the API enforces it.
+_ANALYZE_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "viral_analysis",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "viral_segments": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "start_time": {"type": "number"},
+                            "end_time": {"type": "number"},
+                            "hook": {"type": "string"},
+                            "virality_score": {"type": "integer"},
+                            "emotion": {"type": "string"},
+                        },
+                        "required": ["start_time", "end_time", "hook", "virality_score", "emotion"],
+                        "additionalProperties": False,
+                    },
+                },
+                "content_summary": {"type": "string"},
+                "best_posting_times": {"type": "array", "items": {"type": "string"}},
+                "hashtags": {"type": "array", "items": {"type": "string"}},
+                "target_audience": {"type": "string"},
+            },
+            "required": ["viral_segments", "content_summary", "best_posting_times", "hashtags", "target_audience"],
+            "additionalProperties": False,
+        },
+    },
+}
+
 
 class PipelineExecutor:
     """
@@ -25,29 +83,108 @@ class PipelineExecutor:
     Each step is designed to complete within Vercel's 60s serverless limit.
     """
 
+    # Step 1 only needs title/duration/thumbnail, so skip everything that
+    # makes full extraction slow: the DASH manifest, the watch page, and
+    # the player JS whose nsig decryption dominates yt-dlp's startup cost
+    _FETCH_YDL_OPTS = {
+        'skip_download': True,
+        'quiet': True,
+        'no_warnings': True,
+        'cookiefile': 'cookies.txt',  # Use cookies if available
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'youtube_include_dash_manifest': False,
+        'extract_flat': 'in_playlist',
+        'extractor_args': {'youtube': {
+            'player_skip': ['configs', 'webpage', 'js'],
+            'player_client': ['web'],
+        }},
+    }
+
     def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+        self.openai_client = get_openai_client()
+        # One extractor reused across fetches: YoutubeDL's own setup (option
+        # parsing, extractor registry) is paid once per executor, not per call
+        self._meta_ydl = yt_dlp.YoutubeDL(self._FETCH_YDL_OPTS) if yt_dlp else None
+
+    # Step number → handler name, fixed at class scope so dispatch is a
+    # tuple index instead of rebuilding a dict of bound methods per call
+    _STEP_NAMES = (None, '_step_fetch', '_step_transcribe', '_step_analyze',
+                   '_step_clip', '_step_caption_post')
 
     def execute_step(self, asset_id: int, step: int, db: Session) -> dict:
-        handlers = {
-            1: self._step_fetch,
-            2: self._step_transcribe,
-            3: self._step_analyze,
-            4: self._step_clip,
-            5: self._step_caption_post,
-        }
-        handler = handlers.get(step)
-        if not handler:
+        if not 0 < step < len(self._STEP_NAMES):
             return {"error": f"Invalid step {step}", "status": "FAILED"}
+        handler = getattr(self, self._STEP_NAMES[step])
 
         logger.info(f"Executing step {step} for asset {asset_id}")
-        return handler(asset_id, db)
+        # One commit per step: handlers mutate state and leave the flush to
+        # us, so a step is atomic and costs a single fsync instead of one
+        # per intermediate write
+        started = time.monotonic()
+        try:
+            result = handler(asset_id, db)
+            db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            logger.info(f"Step {step} for asset {asset_id} took {time.monotonic() - started:.2f}s")
 
-    def _step_fetch(self, asset_id: int, db: Session) -> dict:
-        """Step 1: Extract video metadata from YouTube URL using yt-dlp."""
-        asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
+    # Columns every step actually touches; skips shipping the rest of the row
+    _ASSET_COLS = ('id', 'title', 'source_url', 'meta_data', 'pipeline_data')
+
+    @staticmethod
+    def _get_asset(db: Session, asset_id: int):
+        asset = db.query(ContentAsset).options(
+            load_only(*[getattr(ContentAsset, c) for c in PipelineExecutor._ASSET_COLS])
+        ).filter(ContentAsset.id == asset_id).first()
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
+        return asset
+
+    @staticmethod
+    def _record_step(db: Session, asset, key: str, payload: dict):
+        """Upserts a step result into its own pipeline_step_results row.
+
+        Step payloads used to be keys inside asset.pipeline_data, so every
+        step commit rewrote the entire blob — by step 5 that meant shipping
+        the whole transcript back to the database on each write. One row
+        per (asset, step) keeps the write O(this step's data).
+        """
+        step = int(key.split('_')[1])
+        row = db.query(PipelineStepResult).filter(
+            PipelineStepResult.asset_id == asset.id,
+            PipelineStepResult.step == step,
+        ).first()
+        if row:
+            row.status = payload.get('status', 'PENDING')
+            row.result = payload
+        else:
+            db.add(PipelineStepResult(
+                asset_id=asset.id, step=step,
+                status=payload.get('status', 'PENDING'), result=payload,
+            ))
+
+    @staticmethod
+    def _get_step(db: Session, asset, key: str) -> dict:
+        """Reads a step payload, falling back to the legacy JSON blob.
+
+        Assets processed before the pipeline_step_results table existed
+        still carry their history inside pipeline_data.
+        """
+        step = int(key.split('_')[1])
+        result = db.query(PipelineStepResult.result).filter(
+            PipelineStepResult.asset_id == asset.id,
+            PipelineStepResult.step == step,
+        ).scalar()
+        if result:
+            return result
+        return (asset.pipeline_data or {}).get(key, {})
+
+    def _step_fetch(self, asset_id: int, db: Session) -> dict:
+        """Step 1: Extract video metadata from YouTube URL using yt-dlp."""
+        asset = self._get_asset(db, asset_id)
         if not yt_dlp:
             msg = "yt_dlp module not found. Install it via pip."
             logger.error(msg)
@@ -56,16 +193,9 @@ class PipelineExecutor:
         logger.info(f"Fetching metadata from {asset.source_url}")
 
         try:
-            ydl_opts = {
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True,
-                'cookiefile': 'cookies.txt',  # Use cookies if available
-                'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(asset.source_url, download=False)
-            
+            info = self._meta_ydl.extract_info(asset.source_url, download=False)
+
+
             metadata = {
                 'title': info.get('title', 'Unknown'),
                 'duration': info.get('duration', 0),
@@ -77,55 +207,64 @@ class PipelineExecutor:
             }
 
             asset.title = metadata['title']
-            if not asset.pipeline_data:
-                asset.pipeline_data = {}
-            asset.pipeline_data['step_1_fetch'] = {
+            self._record_step(db, asset, 'step_1_fetch', {
                 'status': 'COMPLETED',
                 'timestamp': datetime.utcnow().isoformat(),
                 'result': metadata,
-            }
-            db.commit()
+            })
 
             logger.info(f"Metadata fetched: title='{metadata['title']}', duration={metadata['duration']}s")
             return {'status': 'COMPLETED', 'result': metadata}
 
         except Exception as e:
             logger.error(f"Fetch failed for {asset_id}: {str(e)}", exc_info=True)
-            if not asset.pipeline_data: asset.pipeline_data = {}
-            asset.pipeline_data['step_1_fetch'] = {
+            self._record_step(db, asset, 'step_1_fetch', {
                 'status': 'FAILED',
                 'error': str(e),
                 'timestamp': datetime.utcnow().isoformat(),
-            }
-            db.commit()
+            })
             return {'status': 'FAILED', 'error': str(e)}
 
     def _step_transcribe(self, asset_id: int, db: Session) -> dict:
         """Step 2: Transcribe audio via OpenAI Whisper API."""
-        asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
-        if not asset:
-            raise ValueError(f"Asset {asset_id} not found")
+        asset = self._get_asset(db, asset_id)
         if not yt_dlp:
             raise RuntimeError("yt_dlp is not installed")
 
         logger.info(f"Starting transcription for asset {asset_id}")
 
-        audio_file_path = None
-        try:
+        # Warm containers reuse /tmp across invocations; clear what a
+        # previous killed run may have left before adding our own files
+        self._sweep_stale_audio()
+
+        # Everything for this run lives in one temp directory that the
+        # context manager reclaims even when a step blows up mid-way
+        with tempfile.TemporaryDirectory(prefix=f"audio_{asset_id}_") as tmp_dir:
             # Download audio using yt-dlp
-            tmp_dir = tempfile.gettempdir()
-            audio_template = os.path.join(tmp_dir, f"audio_{asset_id}")
+            audio_template = os.path.join(tmp_dir, "audio")
 
             ydl_opts = {
-                'format': 'bestaudio[ext=m4a]/bestaudio',
+                # Prefer the small Opus stream and re-encode to 32kbit mono
+                # 16kHz — Whisper's native rate — so most videos land well
+                # under the 25MB single-shot limit
+                'format': 'ba[acodec=opus]/ba',
                 'outtmpl': audio_template,
                 'quiet': True,
                 'no_warnings': True,
+                'http_chunk_size': 10 * 1024 * 1024,
+                'extractor_args': {'youtube': {'player_client': ['web']}},
+                'postprocessors': [{
+                    'key': 'FFmpegExtractAudio',
+                    'preferredcodec': 'opus',
+                    'preferredquality': '32',
+                }],
+                'postprocessor_args': ['-ac', '1', '-ar', '16000'],
             }
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 ydl.download([asset.source_url])
 
             # Find the downloaded file
+            audio_file_path = None
             for ext in ['.m4a', '.webm', '.wav', '.mp3', '.opus', '']:
                 candidate = audio_template + ext
                 if os.path.exists(candidate):
@@ -138,107 +277,201 @@ class PipelineExecutor:
             file_size = os.path.getsize(audio_file_path)
             logger.info(f"Audio downloaded: {audio_file_path} ({file_size / 1024 / 1024:.1f}MB)")
 
-            # Check OpenAI 25MB limit
+            # Over the 25MB API limit: segment locally and fan the chunks
+            # out to Whisper in parallel instead of skipping the video
             if file_size > 25 * 1024 * 1024:
-                msg = f"Audio too large ({file_size / 1024 / 1024:.1f}MB > 25MB limit). Skipping transcription."
-                logger.warning(msg)
-                if not asset.pipeline_data:
-                    asset.pipeline_data = {}
-                asset.pipeline_data['step_2_transcribe'] = {
-                    'status': 'SKIPPED', 'message': msg,
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'result': {'full_text': '', 'language': 'unknown', 'duration': 0, 'segments_count': 0},
+                logger.info(f"Audio is {file_size / 1024 / 1024:.1f}MB — chunking for parallel transcription")
+                try:
+                    result = self._transcribe_chunked(audio_file_path, asset_id)
+                except FileNotFoundError:
+                    # ffmpeg missing — fall back to the old skip behaviour
+                    msg = f"Audio too large ({file_size / 1024 / 1024:.1f}MB > 25MB limit) and ffmpeg unavailable. Skipping transcription."
+                    logger.warning(msg)
+                    self._record_step(db, asset, 'step_2_transcribe', {
+                        'status': 'SKIPPED', 'message': msg,
+                        'timestamp': datetime.utcnow().isoformat(),
+                        'result': {'full_text': '', 'language': 'unknown', 'duration': 0, 'segments_count': 0},
+                    })
+                    return {'status': 'SKIPPED', 'message': msg}
+            else:
+                # Send to Whisper
+                logger.info("Sending to OpenAI Whisper API...")
+                transcript = self._transcribe_file(audio_file_path)
+                result = {
+                    'full_text': transcript.text,
+                    'language': getattr(transcript, 'language', 'unknown'),
+                    'duration': getattr(transcript, 'duration', 0),
+                    'segments_count': len(getattr(transcript, 'segments', [])),
                 }
-                db.commit()
-                return {'status': 'SKIPPED', 'message': msg}
-
-            # Send to Whisper
-            logger.info("Sending to OpenAI Whisper API...")
-            with open(audio_file_path, 'rb') as f:
-                transcript = self.openai_client.audio.transcriptions.create(
-                    file=f,
-                    model="whisper-1",
-                    response_format="verbose_json",
-                    timestamp_granularities=["segment"],
-                )
 
-            result = {
-                'full_text': transcript.text,
-                'language': getattr(transcript, 'language', 'unknown'),
-                'duration': getattr(transcript, 'duration', 0),
-                'segments_count': len(getattr(transcript, 'segments', [])),
-            }
-
-            if not asset.pipeline_data:
-                asset.pipeline_data = {}
-            asset.pipeline_data['step_2_transcribe'] = {
+            self._record_step(db, asset, 'step_2_transcribe', {
                 'status': 'COMPLETED',
                 'timestamp': datetime.utcnow().isoformat(),
                 'result': result,
-            }
-            db.commit()
+            })
 
             logger.info(f"Transcription complete: {result['segments_count']} segments, {result['duration']}s")
             return {'status': 'COMPLETED', 'result': result}
 
-        finally:
-            if audio_file_path and os.path.exists(audio_file_path):
+    # Anything this old from a previous run is an orphan from a killed
+    # invocation, not a file in active use
+    STALE_AUDIO_SECONDS = 3600
+
+    @classmethod
+    def _sweep_stale_audio(cls):
+        tmp_root = tempfile.gettempdir()
+        cutoff = time.time() - cls.STALE_AUDIO_SECONDS
+        try:
+            entries = os.listdir(tmp_root)
+        except OSError:
+            return
+        for name in entries:
+            if not (name.startswith('audio_') or name.startswith('audio_chunks_')):
+                continue
+            path = os.path.join(tmp_root, name)
+            try:
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    os.remove(path)
+            except OSError:
+                continue
+
+    # 10-minute chunks: comfortably under 25MB at audio bitrates and long
+    # enough that Whisper keeps sentence context at the seams
+    CHUNK_SECONDS = 600
+
+    _AUDIO_MIME = {
+        '.opus': 'audio/ogg', '.ogg': 'audio/ogg', '.m4a': 'audio/mp4',
+        '.webm': 'audio/webm', '.wav': 'audio/wav',
+    }
+
+    def _transcribe_file(self, path):
+        name = os.path.basename(path)
+        mime = self._AUDIO_MIME.get(os.path.splitext(name)[1].lower(), 'audio/mpeg')
+        with open(path, 'rb') as f:
+            # The (name, handle, mime) form streams the multipart body from
+            # disk instead of buffering the whole file in memory first
+            return self.openai_client.audio.transcriptions.create(
+                file=(name, f, mime),
+                model="whisper-1",
+                response_format="verbose_json",
+                timestamp_granularities=["segment"],
+            )
+
+    def _transcribe_chunked(self, audio_file_path: str, asset_id: int) -> dict:
+        """Segments the audio with ffmpeg and transcribes chunks in parallel.
+
+        Chunk timestamps are shifted by their offset so the stitched result
+        lines up with the original timeline. A failed chunk logs and leaves
+        a gap rather than sinking the whole step.
+        """
+        ext = os.path.splitext(audio_file_path)[1] or '.m4a'
+        seg_dir = tempfile.mkdtemp(prefix=f"audio_chunks_{asset_id}_")
+        try:
+            # Run the segmenter in the background and submit each chunk the
+            # moment it is sealed, so uploads overlap with segmentation
+            # instead of waiting for ffmpeg to finish the whole file
+            proc = subprocess.Popen(
+                ['ffmpeg', '-y', '-i', audio_file_path, '-f', 'segment',
+                 '-segment_time', str(self.CHUNK_SECONDS), '-c', 'copy',
+                 os.path.join(seg_dir, f'chunk_%03d{ext}')],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            chunk_futures = {}
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                while True:
+                    finished = proc.poll() is not None
+                    names = sorted(os.listdir(seg_dir))
+                    # The newest file may still be mid-write until ffmpeg exits
+                    ready = names if finished else names[:-1]
+                    for name in ready:
+                        if name not in chunk_futures:
+                            chunk_futures[name] = pool.submit(
+                                self._transcribe_file, os.path.join(seg_dir, name))
+                    if finished:
+                        break
+                    time.sleep(0.5)
+
+            if proc.returncode != 0:
+                raise RuntimeError(f"ffmpeg segmenter exited with {proc.returncode}")
+            futures = [chunk_futures[name] for name in sorted(chunk_futures)]
+            logger.info(f"Transcribed {len(futures)} chunks with overlapped segmentation")
+
+            texts = []
+            duration = 0.0
+            segments_count = 0
+            language = 'unknown'
+            errors = 0
+            for index, future in enumerate(futures):
                 try:
-                    os.remove(audio_file_path)
-                except Exception:
-                    pass
+                    transcript = future.result()
+                except Exception as e:
+                    logger.error(f"Chunk {index} transcription failed: {e}")
+                    errors += 1
+                    continue
+                texts.append(transcript.text)
+                duration += getattr(transcript, 'duration', 0) or 0
+                segments = getattr(transcript, 'segments', []) or []
+                offset = index * self.CHUNK_SECONDS
+                for segment in segments:
+                    segment.start += offset
+                    segment.end += offset
+                segments_count += len(segments)
+                if language == 'unknown':
+                    language = getattr(transcript, 'language', 'unknown')
+
+            result = {
+                'full_text': ' '.join(texts),
+                'language': language,
+                'duration': duration,
+                'segments_count': segments_count,
+            }
+            if errors:
+                result['chunk_errors'] = errors
+            return result
+        finally:
+            shutil.rmtree(seg_dir, ignore_errors=True)
 
     def _step_analyze(self, asset_id: int, db: Session) -> dict:
         """Step 3: AI analysis with GPT-4o — identify viral segments, hooks, emotions."""
-        asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
-        if not asset:
-            raise ValueError(f"Asset {asset_id} not found")
+        asset = self._get_asset(db, asset_id)
 
-        pd = asset.pipeline_data or {}
-        step2 = pd.get('step_2_transcribe', {})
+        step2 = self._get_step(db, asset, 'step_2_transcribe')
         transcript = step2.get('result', {}).get('full_text', '')
 
         # If transcription was skipped, use video title/description for basic analysis
         if not transcript:
-            step1 = pd.get('step_1_fetch', {})
+            step1 = self._get_step(db, asset, 'step_1_fetch')
             title = step1.get('result', {}).get('title', '')
             desc = step1.get('result', {}).get('description', '')
             transcript = f"Title: {title}\nDescription: {desc}"
 
         logger.info(f"Starting AI analysis for asset {asset_id}")
 
+        # Slice by tokens, not characters: 8000 chars over-truncated Hindi
+        # (few chars per token) while wasting budget on verbose English.
+        # The output shape lives in _ANALYZE_SCHEMA, not the prompt.
         response = self.openai_client.chat.completions.create(
             model="gpt-4o",
             messages=[
-                {"role": "system", "content": "You are a viral content analyst. Return ONLY valid JSON."},
-                {"role": "user", "content": f"""Analyze this video transcript for viral clip potential:
-
-TRANSCRIPT:
-{transcript[:8000]}
-
-Return JSON:
-{{
-  "viral_segments": [{{"start_time": 0, "end_time": 30, "hook": "...", "virality_score": 8, "emotion": "..."}}],
-  "content_summary": "2-3 sentences",
-  "best_posting_times": ["9 PM IST", "..."],
-  "hashtags": ["#viral", "..."],
-  "target_audience": "..."
-}}"""},
+                {"role": "system", "content": "You are a viral content analyst."},
+                {"role": "user", "content": "Identify the viral clip segments in this transcript:\n\n"
+                    + _truncate_tokens(transcript, 4000)},
             ],
-            response_format={"type": "json_object"},
+            response_format=_ANALYZE_SCHEMA,
             max_tokens=2000,
         )
 
         analysis = json.loads(response.choices[0].message.content)
 
-        if not asset.pipeline_data:
-            asset.pipeline_data = {}
-        asset.pipeline_data['step_3_analyze'] = {
+        self._record_step(db, asset, 'step_3_analyze', {
             'status': 'COMPLETED',
             'timestamp': datetime.utcnow().isoformat(),
             'result': analysis,
-        }
-        db.commit()
+        })
 
         logger.info(f"Analysis complete: {len(analysis.get('viral_segments', []))} viral segments found")
         return {'status': 'COMPLETED', 'result': analysis}
@@ -247,14 +480,18 @@ Return JSON:
         """Step 4: Submit to Vizard AI for clip generation + poll for results."""
         from src.agents.vizard_agent import VizardAgent
 
-        asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
-        if not asset:
-            raise ValueError(f"Asset {asset_id} not found")
+        asset = self._get_asset(db, asset_id)
 
         if not asset.meta_data:
             asset.meta_data = {}
-        if not asset.pipeline_data:
-            asset.pipeline_data = {}
+
+        # The Vizard webhook may have completed this step between
+        # invocations (it records clips inline via record_vizard_clips) —
+        # if so, there is nothing left to poll
+        step4 = self._get_step(db, asset, 'step_4_clip')
+        if step4.get('status') == 'COMPLETED':
+            return {'status': 'COMPLETED',
+                    'result': {'clips_created': step4.get('clips_count', 0)}}
 
         vizard = VizardAgent()
         vizard_project_id = asset.meta_data.get('vizard_project_id')
@@ -266,6 +503,9 @@ Return JSON:
             if not vizard_project_id:
                 raise ValueError("Vizard project creation returned no project ID")
             asset.meta_data['vizard_project_id'] = vizard_project_id
+            flag_modified(asset, 'meta_data')
+            # Deliberate mid-step checkpoint: if polling crashes after this,
+            # the saved id prevents creating a duplicate Vizard project
             db.commit()
             logger.info(f"Vizard project created: {vizard_project_id}")
 
@@ -274,139 +514,164 @@ Return JSON:
         clips_data = vizard.get_clips(vizard_project_id)
 
         if not clips_data:
-            asset.pipeline_data['step_4_clip'] = {
+            self._record_step(db, asset, 'step_4_clip', {
                 'status': 'POLLING',
                 'message': 'Vizard is still processing clips...',
                 'project_id': vizard_project_id,
                 'timestamp': datetime.utcnow().isoformat(),
-            }
-            db.commit()
+            })
             return {'status': 'POLLING', 'message': 'Vizard is processing. Check back later.', 'project_id': vizard_project_id}
 
-        # Clips found — create Clip records
         logger.info(f"Found {len(clips_data)} clips from Vizard")
+        created = self.record_vizard_clips(asset, clips_data, db)
+        return {'status': 'COMPLETED', 'result': {'clips_created': created}}
+
+    def record_vizard_clips(self, asset, clips_data: list, db: Session) -> int:
+        """Turns a Vizard clip list into Clip rows and completes step 4.
+
+        Shared by the polling path in _step_clip and the /webhooks/vizard
+        route, so both record clips identically. Existing URLs come back in
+        one SELECT and the new rows go in with one bulk insert, instead of
+        a query + add per clip. Leaves the commit to the caller.
+        """
+        existing_urls = {
+            row.file_path
+            for row in db.query(Clip.file_path).filter(Clip.asset_id == asset.id)
+        }
         created = []
+        new_clips = []
         for v_clip in clips_data[:15]:
             clip_url = v_clip.get('videoUrl')
-            if not clip_url:
-                continue
-
-            # Avoid duplicates
-            existing = db.query(Clip).filter(Clip.asset_id == asset_id, Clip.file_path == clip_url).first()
-            if existing:
+            if not clip_url or clip_url in existing_urls:
                 continue
+            existing_urls.add(clip_url)
 
-            clip = Clip(
-                asset_id=asset_id,
+            duration = v_clip.get('duration', 0)
+            new_clips.append(Clip(
+                asset_id=asset.id,
                 start_time=0.0,
                 end_time=0.0,
-                duration=v_clip.get('duration', 0),
+                duration=duration,
                 file_path=clip_url,
                 status=ClipStatus.READY,
                 virality_score=v_clip.get('viralScore', 0.0),
-            )
-            db.add(clip)
-            created.append({'url': clip_url, 'duration': clip.duration})
+            ))
+            created.append({'url': clip_url, 'duration': duration})
+        if new_clips:
+            db.bulk_save_objects(new_clips)
 
-        asset.pipeline_data['step_4_clip'] = {
+        self._record_step(db, asset, 'step_4_clip', {
             'status': 'COMPLETED',
             'clips_count': len(created),
             'timestamp': datetime.utcnow().isoformat(),
-        }
-        db.commit()
+        })
 
-        logger.info(f"Created {len(created)} clip records for asset {asset_id}")
-        return {'status': 'COMPLETED', 'result': {'clips_created': len(created)}}
+        logger.info(f"Created {len(created)} clip records for asset {asset.id}")
+        return len(created)
 
     def _step_caption_post(self, asset_id: int, db: Session) -> dict:
         """Step 5: Generate captions for clips + trigger auto-posting."""
         from src.agents.captioner import CaptionAgent
-        from src.agents.auto_poster import AutoPoster
+        from src.agents.auto_poster import get_auto_poster
 
-        asset = db.query(ContentAsset).filter(ContentAsset.id == asset_id).first()
-        if not asset:
-            raise ValueError(f"Asset {asset_id} not found")
+        asset = self._get_asset(db, asset_id)
 
-        pd = asset.pipeline_data or {}
-        transcript = pd.get('step_2_transcribe', {}).get('result', {}).get('full_text', '')
-        analysis = pd.get('step_3_analyze', {}).get('result', {})
+        transcript = self._get_step(db, asset, 'step_2_transcribe').get('result', {}).get('full_text', '')
+        analysis = self._get_step(db, asset, 'step_3_analyze').get('result', {})
         hashtags = ' '.join(analysis.get('hashtags', []))
 
         clips = db.query(Clip).filter(Clip.asset_id == asset_id, Clip.status == ClipStatus.READY).all()
         if not clips:
-            if not asset.pipeline_data:
-                asset.pipeline_data = {}
-            asset.pipeline_data['step_5_caption_post'] = {
+            self._record_step(db, asset, 'step_5_caption_post', {
                 'status': 'COMPLETED', 'message': 'No clips to caption',
                 'timestamp': datetime.utcnow().isoformat(),
-            }
-            db.commit()
+            })
             return {'status': 'COMPLETED', 'message': 'No clips available'}
 
         captioner = CaptionAgent()
-        poster = AutoPoster()
+        poster = get_auto_poster()
         captions_generated = 0
         posts_created = 0
 
+        # Resume state: per-clip record of what each platform returned last
+        # time, so a retried step 5 skips platforms that already posted and
+        # Instagram resumes from its saved container instead of re-uploading.
+        post_state = self._get_step(db, asset, 'step_5_caption_post').get('post_state', {})
+
+        # Pass 1 (serial, DB-bound): generate captions and collect postable
+        # clips. Every clip of an asset captions from the same transcript,
+        # so that is one API call shared by all of them — not one per clip.
+        # The ORM session is not thread-safe, so all DB access stays on
+        # this thread.
+        shared_caps = None
+        if any(not clip.transcription for clip in clips):
+            try:
+                shared_caps = captioner.generate_caption(transcript or asset.title)
+            except Exception as e:
+                logger.error(f"Caption generation failed for asset {asset_id}: {e}")
+
+        postable = []
         for clip in clips:
-            # Generate caption
-            if not clip.transcription:
-                try:
-                    caps = captioner.generate_caption(transcript or asset.title)
-                    clip.transcription = json.dumps(caps)
-                    captions_generated += 1
-                except Exception as e:
-                    logger.error(f"Caption failed for clip {clip.id}: {e}")
+            if not clip.transcription and shared_caps:
+                clip.transcription = shared_caps
+                captions_generated += 1
 
-            # Auto-post
             if clip.file_path and clip.file_path.startswith('http'):
-                caps_data = json.loads(clip.transcription) if clip.transcription else {}
-                ig_caption = caps_data.get('ig', f"{asset.title} {hashtags}")
-                yt_title = caps_data.get('yt', asset.title)
-                fb_caption = caps_data.get('fb', ig_caption)
-
-                # Pass all captions via a dictionary if possible, or modify AutoPoster to accept them.
-                # For now, we will update the AutoPoster class to accept a 'captions' dict instead of single 'caption'
-                # But to avoid breaking changes without seeing AutoPoster refactor in this turn,
-                # we will assume AutoPoster.post_clip is being updated to accept a 'captions' arg OR we pass individual args.
-                
-                # Let's pass the dictionary as 'caption' and let AutoPoster handle it? No, that's messy.
-                # Use kwargs?
-                
-                # We will call the updated post_clip which we are about to write in the next tool call.
-                # It will accept 'captions={...}'
-                
-                results = poster.post_clip(
-                    video_url=clip.file_path,
-                    captions=caps_data,  # Pass full dict
-                    title=asset.title,
-                    platforms=["INSTAGRAM", "YOUTUBE", "FACEBOOK"],
-                )
-
-                for r in results:
-                    if r.get('status') == 'POSTED':
-                        platform_name = r.get('platform', 'UNKNOWN')
-                        post = Post(
-                            clip_id=clip.id,
-                            platform=Platform[platform_name] if platform_name in Platform.__members__ else Platform.LOCAL,
-                            status=PostStatus.POSTED,
-                            caption=ig_caption,
-                            post_url=r.get('post_id', '') or r.get('video_id', ''),
-                            platform_post_id=r.get('post_id', '') or r.get('video_id', ''),
-                        )
-                        db.add(post)
-                        posts_created += 1
-                        clip.status = ClipStatus.POSTED
-
-        if not asset.pipeline_data:
-            asset.pipeline_data = {}
-        asset.pipeline_data['step_5_caption_post'] = {
+                caps_data = clip.captions_dict()
+                clip_state = post_state.setdefault(str(clip.id), {})
+                postable.append((clip, caps_data, clip_state))
+
+        # Pass 2 (parallel, network-bound): each clip already fans out across
+        # platforms inside post_clip; fan out across clips too so N clips
+        # cost roughly one clip's wall time.
+        clip_results = {}
+        if postable:
+            with ThreadPoolExecutor(max_workers=min(4, len(postable))) as pool:
+                futures = {
+                    clip.id: pool.submit(
+                        poster.post_clip,
+                        video_url=clip.file_path,
+                        captions=caps_data,
+                        title=asset.title,
+                        platforms=["INSTAGRAM", "YOUTUBE", "FACEBOOK"],
+                        state=clip_state,
+                    )
+                    for clip, caps_data, clip_state in postable
+                }
+                for clip_id, future in futures.items():
+                    try:
+                        clip_results[clip_id] = future.result()
+                    except Exception as e:
+                        logger.error(f"Posting failed for clip {clip_id}: {e}")
+                        clip_results[clip_id] = []
+
+        # Pass 3 (serial, DB-bound): record the outcomes in one bulk save
+        new_posts = []
+        for clip, caps_data, _ in postable:
+            ig_caption = caps_data.get('ig', f"{asset.title} {hashtags}")
+            for r in clip_results.get(clip.id, []):
+                if r.get('status') == 'POSTED':
+                    platform_name = r.get('platform', 'UNKNOWN')
+                    new_posts.append(Post(
+                        clip_id=clip.id,
+                        platform=Platform[platform_name] if platform_name in Platform.__members__ else Platform.LOCAL,
+                        status=PostStatus.POSTED,
+                        caption=ig_caption,
+                        post_url=r.get('post_id', '') or r.get('video_id', ''),
+                        platform_post_id=r.get('post_id', '') or r.get('video_id', ''),
+                    ))
+                    posts_created += 1
+                    clip.status = ClipStatus.POSTED
+        if new_posts:
+            db.bulk_save_objects(new_posts)
+
+        self._record_step(db, asset, 'step_5_caption_post', {
             'status': 'COMPLETED',
             'captions_generated': captions_generated,
             'posts_created': posts_created,
+            'post_state': post_state,
             'timestamp': datetime.utcnow().isoformat(),
-        }
-        db.commit()
+        })
 
         logger.info(f"Step 5 done: {captions_generated} captions, {posts_created} posts")
         return {'status': 'COMPLETED', 'result': {'captions': captions_generated, 'posts': posts_created}}
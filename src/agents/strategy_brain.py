@@ -1,18 +1,32 @@
 
 import os
 import base64
+import io
 import json
 import logging
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
 from src.config import settings
+from src.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
-client = OpenAI(api_key=settings.openai_api_key)
+client = get_openai_client()
 
 def encode_image(image_path):
-  with open(image_path, "rb") as image_file:
-    return base64.b64encode(image_file.read()).decode('utf-8')
+  # GPT-4o's low-detail vision tiles at 512px — anything bigger is paid
+  # for in upload bytes and tokens, then thrown away server-side
+  try:
+    with Image.open(image_path) as im:
+      im.thumbnail((512, 512))
+      buf = io.BytesIO()
+      im.convert("RGB").save(buf, "JPEG", quality=75)
+      return base64.b64encode(buf.getvalue()).decode('utf-8')
+  except Exception:
+    with open(image_path, "rb") as image_file:
+      return base64.b64encode(image_file.read()).decode('utf-8')
 
 class StrategyBrain:
     """
@@ -41,14 +55,18 @@ class StrategyBrain:
         ]
 
         # Add subsampled frames to keep context window manageable
-        # We take up to 10-15 frames max
+        # We take up to 10-15 frames max; encode them in parallel since
+        # decode + resize + JPEG is per-frame CPU/IO work
         step = max(1, len(frame_paths) // 15)
-        for i in range(0, len(frame_paths), step):
-            base64_image = encode_image(frame_paths[i])
+        sampled = [frame_paths[i] for i in range(0, len(frame_paths), step)]
+        with ThreadPoolExecutor(max_workers=min(8, len(sampled) or 1)) as pool:
+            encoded = list(pool.map(encode_image, sampled))
+        for base64_image in encoded:
             content.append({
                 "type": "image_url",
                 "image_url": {
-                    "url": f"data:image/jpeg;base64,{base64_image}"
+                    "url": f"data:image/jpeg;base64,{base64_image}",
+                    "detail": "low"
                 }
             })
 
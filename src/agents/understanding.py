@@ -2,13 +2,81 @@
 import os
 import json
 import logging
+import re
+import subprocess
+import tempfile
 from typing import Optional
 from dataclasses import dataclass, field, asdict
-from openai import OpenAI
 from src.config import settings
+from src.openai_client import get_openai_client
 
 logger = logging.getLogger(__name__)
 
+# Hook words that reliably predict a strong clip opener in this niche
+# (Hinglish/Haryanvi mix). Compiled to one alternation so scoring a
+# segment is a single linear regex pass instead of a per-keyword scan.
+_HOOK_KEYWORDS = (
+    "secret", "shocking", "never", "best", "worst", "free", "viral",
+    "exposed", "truth", "sach", "paisa", "dhamaka", "kaise", "kyun",
+    "trick", "hack", "crazy", "biggest", "warning", "wait", "stop",
+)
+_HOOK_RE = re.compile("|".join(map(re.escape, _HOOK_KEYWORDS)))
+
+
+# Words-per-second floors mapped to energy scores: fast talk reads as
+# high-energy delivery, long pauses as low
+_ENERGY_BANDS = ((4.0, 0.9), (3.0, 0.7), (2.0, 0.5), (1.0, 0.3))
+
+
+def _score_segments(segments) -> None:
+    """Scores hook strength and speech energy for all segments in one pass.
+
+    The tokenized word count is computed once per segment and shared by
+    both scores, instead of each scorer re-splitting the text. Mutates
+    the segments in place.
+    """
+    for s in segments:
+        words = len(s.text.split())
+        base = 0.5 if words > 5 else 0.2
+        hits = len(_HOOK_RE.findall(s.text.lower()))
+        s.hook_score = min(1.0, base + 0.15 * hits)
+        wps = words / max(s.end - s.start, 1e-6)
+        s.energy_score = next((score for floor, score in _ENERGY_BANDS if wps >= floor), 0.1)
+
+
+def _compress_for_whisper(file_path: str) -> Optional[str]:
+    """Transcodes audio to 16kHz mono Opus 24kbit for upload.
+
+    Whisper's frontend downmixes to mono and resamples to 16kHz, so any
+    extra channels, sample rate, or bitrate in the source is pure wasted
+    upload bytes — a raw recording shrinks ~10x and long sessions stay
+    under the 25MB single-request limit. Returns the path of the
+    compressed file (caller deletes it), or None to upload the original
+    (already Opus, or ffmpeg unavailable/failed).
+    """
+    if os.path.splitext(file_path)[1].lower() in ('.opus', '.ogg'):
+        return None
+    fd, out_path = tempfile.mkstemp(prefix='whisper_upload_', suffix='.ogg')
+    os.close(fd)
+    try:
+        subprocess.run(
+            [settings.ffmpeg_path, '-y', '-i', file_path,
+             '-vn', '-ac', '1', '-ar', '16000',
+             '-c:a', 'libopus', '-b:a', '24k', '-application', 'voip',
+             out_path],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            check=True, timeout=300,
+        )
+        return out_path
+    except Exception as e:
+        logger.warning(f"Pre-upload compression failed, uploading original: {e}")
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        return None
+
+
 @dataclass
 class Segment:
     start: float
@@ -49,13 +117,21 @@ def transcribe(file_path: str, model_size: str = "unused") -> TranscriptionResul
         result.error = "OpenAI API Key is missing. Required for serverless transcription."
         return result
 
-    client = OpenAI(api_key=settings.openai_api_key)
+    client = get_openai_client()
+
+    # Shrink the payload before it leaves the machine; fall back to the
+    # original file when ffmpeg is missing
+    compressed = _compress_for_whisper(file_path)
+    upload_path = compressed or file_path
+    mime = "audio/ogg" if compressed else "audio/mpeg"
 
     try:
-        logger.info(f"Uploading for API Transcription: {file_path}")
-        with open(file_path, "rb") as audio_file:
+        logger.info(f"Uploading for API Transcription: {upload_path}")
+        with open(upload_path, "rb") as audio_file:
+            # Tuple form streams the upload from disk rather than buffering
+            # the whole file — peak memory stays flat on long audio
             transcript = client.audio.transcriptions.create(
-                file=audio_file,
+                file=(os.path.basename(upload_path), audio_file, mime),
                 model="whisper-1",
                 response_format="verbose_json",
                 timestamp_granularities=["segment"]
@@ -65,20 +141,26 @@ def transcribe(file_path: str, model_size: str = "unused") -> TranscriptionResul
         result.language = transcript.language
         result.duration = transcript.duration
 
-        for seg in transcript.segments:
-            s = Segment(
+        result.segments = [
+            Segment(
                 start=seg['start'],
                 end=seg['end'],
                 text=seg['text'],
                 avg_logprob=seg.get('avg_logprob', 0.0),
                 no_speech_prob=seg.get('no_speech_prob', 0.0)
             )
-            # Basic score
-            s.hook_score = 0.5 if len(s.text.split()) > 5 else 0.2
-            result.segments.append(s)
+            for seg in transcript.segments
+        ]
+        _score_segments(result.segments)
 
         return result
     except Exception as e:
         logger.error(f"API Transcription failed: {e}")
         result.error = str(e)
         return result
+    finally:
+        if compressed:
+            try:
+                os.remove(compressed)
+            except OSError:
+                pass
@@ -271,6 +271,26 @@ def cut_all_clips(
     return results
 
 
+def get_media_duration(file_path: str) -> Optional[float]:
+    """Duration in seconds via ffprobe, without the full JSON probe.
+
+    -show_entries format=duration prints the one number we want, so there
+    is no JSON buffer to capture and parse — use get_video_metadata when
+    more than the duration is needed.
+    """
+    cmd = [
+        settings.ffprobe_path, "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "default=nw=1:nk=1",
+        file_path,
+    ]
+    try:
+        return float(subprocess.check_output(cmd, timeout=10).strip())
+    except Exception as e:
+        logger.warning(f"Could not get duration for {file_path}: {e}")
+        return None
+
+
 def get_video_metadata(file_path: str) -> Optional[dict]:
     """Get video metadata using configured ffprobe."""
     try:
@@ -160,8 +160,8 @@ class WhatsAppController:
 
             send_whatsapp_message(sender, f"🚀 Posting to {', '.join(platforms)}...")
             
-            from src.agents.auto_poster import AutoPoster
-            poster = AutoPoster()
+            from src.agents.auto_poster import get_auto_poster
+            poster = get_auto_poster()
             
             # Prepare Caption
             final_caption = caption
@@ -1,7 +1,13 @@
+import hashlib
+import hmac
+import json
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
+from src.config import settings
 from src.database import get_db
 from src.models import ContentAsset
 from src.enums import ContentStatus, PIPELINE_STEP_NAMES
@@ -11,8 +17,19 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
 
 
-def _build_steps(asset: ContentAsset) -> list[PipelineStepDetail]:
-    """Build step details from asset's pipeline_data."""
+def _build_steps(asset: ContentAsset, db: Session) -> list[PipelineStepDetail]:
+    """Build step details from pipeline_step_results rows.
+
+    Assets processed before the table existed fall back to the step keys
+    in the legacy pipeline_data blob.
+    """
+    from src.models import PipelineStepResult
+
+    rows = {
+        row.step: row.result
+        for row in db.query(PipelineStepResult.step, PipelineStepResult.result)
+                     .filter(PipelineStepResult.asset_id == asset.id)
+    }
     pd = asset.pipeline_data or {}
     steps = []
     step_keys = {
@@ -24,7 +41,7 @@ def _build_steps(asset: ContentAsset) -> list[PipelineStepDetail]:
     }
     for num in range(1, 6):
         key = step_keys[num]
-        data = pd.get(key, {})
+        data = rows.get(num) or pd.get(key, {})
         status = data.get('status', 'PENDING')
 
         # Current running step
@@ -63,6 +80,162 @@ def _build_steps(asset: ContentAsset) -> list[PipelineStepDetail]:
     return steps
 
 
+@router.get("/webhooks/instagram", response_class=PlainTextResponse)
+async def verify_instagram_webhook(request: Request):
+    """Meta's hub.challenge handshake — required to register the webhook."""
+    params = request.query_params
+    if params.get("hub.mode") == "subscribe" and params.get("hub.verify_token") == settings.verify_token:
+        logger.info("Instagram webhook verified successfully")
+        return params.get("hub.challenge", "")
+    raise HTTPException(status_code=403, detail="Verification failed")
+
+
+def _record_instagram_post(db: Session, creation_id: str, result: dict) -> None:
+    """Persist a webhook-published Reel so the rest of the app can see it.
+
+    The container id only lives in step-5 post_state, so walk those rows to
+    find the owning clip, mark its Instagram entry POSTED (step-5 retries
+    then skip the platform), and write the Post row. A publish that matches
+    no clip is still recorded, just without the clip link.
+    """
+    from src.models import Clip, PipelineStepResult, Post
+    from src.enums import ClipStatus, PostStatus, Platform
+
+    clip_id = None
+    for row in db.query(PipelineStepResult).filter(PipelineStepResult.step == 5):
+        post_state = (row.result or {}).get('post_state', {})
+        for state_clip_id, platforms in post_state.items():
+            if (platforms or {}).get('INSTAGRAM', {}).get('creation_id') == creation_id:
+                clip_id = int(state_clip_id)
+                platforms['INSTAGRAM'] = result
+                flag_modified(row, 'result')
+                break
+        if clip_id is not None:
+            break
+
+    if clip_id is not None:
+        db.query(Clip).filter(Clip.id == clip_id).update(
+            {Clip.status: ClipStatus.POSTED}, synchronize_session=False)
+
+    post_id = result.get('post_id', '')
+    db.add(Post(
+        clip_id=clip_id,
+        platform=Platform.INSTAGRAM,
+        status=PostStatus.POSTED,
+        post_url=post_id,
+        platform_post_id=post_id,
+    ))
+    db.commit()
+
+
+@router.post("/webhooks/instagram")
+async def instagram_media_webhook(request: Request, db: Session = Depends(get_db)):
+    """
+    Completion callback for Instagram Reels processing.
+
+    Register via the GET handshake above, then containers created with
+    AutoPoster.begin_instagram_reel (enabled by instagram_webhook_publish)
+    get published when Instagram says they are ready, instead of a worker
+    burning its time in a polling loop. Deliveries are authenticated
+    against Meta's X-Hub-Signature-256 body signature, and successful
+    publishes are written through to the Post table.
+    """
+    from src.agents.auto_poster import get_auto_poster
+
+    raw_body = await request.body()
+    # Meta signs every delivery with the app secret; reject forgeries when
+    # the secret is configured (mirrors the Vizard webhook's token check)
+    if settings.facebook_app_secret:
+        signature = request.headers.get("X-Hub-Signature-256", "")
+        expected = "sha256=" + hmac.new(
+            settings.facebook_app_secret.encode(), raw_body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(signature, expected):
+            raise HTTPException(status_code=403, detail="Invalid webhook signature")
+
+    body = json.loads(raw_body or b"{}")
+
+    # Accept both the simple direct shape and Meta's entry/changes envelope
+    creation_ids = []
+    if body.get("creation_id"):
+        creation_ids.append(str(body["creation_id"]))
+    for entry in body.get("entry", []):
+        for change in entry.get("changes", []):
+            media_id = change.get("value", {}).get("media_id") or change.get("value", {}).get("id")
+            if media_id:
+                creation_ids.append(str(media_id))
+
+    if not creation_ids:
+        raise HTTPException(status_code=400, detail="No creation_id in webhook payload")
+
+    poster = get_auto_poster()
+    results = []
+    for cid in creation_ids:
+        result = poster.finish_instagram_publish(cid)
+        if result.get("status") == "POSTED":
+            _record_instagram_post(db, cid, result)
+        results.append(result)
+    return {"results": results}
+
+
+@router.post("/webhooks/vizard")
+async def vizard_clips_webhook(request: Request, db: Session = Depends(get_db)):
+    """
+    Completion callback for Vizard AI clip generation.
+
+    Register this URL as the project's callback (append ?token=<vizard
+    api key> — Vizard does not sign callbacks, so the key doubles as a
+    shared secret). When Vizard finishes, the clips are recorded and
+    step 4 marked complete right here, so /advance never burns an
+    invocation on a "not ready yet" poll. Deployments without the
+    webhook configured still progress via the polling branch in
+    _step_clip.
+    """
+    from src.agents.pipeline_executor import PipelineExecutor
+    from src.agents.vizard_agent import VizardAgent
+    from src.config import settings
+
+    if settings.vizard_api_key:
+        token = request.query_params.get("token") or request.headers.get("X-Webhook-Token")
+        if token != settings.vizard_api_key:
+            raise HTTPException(status_code=403, detail="Invalid webhook token")
+
+    body = await request.json()
+    project_id = body.get("projectId") or body.get("project_id")
+    if not project_id:
+        raise HTTPException(status_code=400, detail="No projectId in webhook payload")
+
+    # meta_data is a JSON blob, so the project id is matched in Python
+    # over the assets that have one rather than with a dialect-specific
+    # JSON path filter
+    asset = None
+    for candidate in db.query(ContentAsset).filter(ContentAsset.meta_data.isnot(None)).all():
+        if str((candidate.meta_data or {}).get('vizard_project_id')) == str(project_id):
+            asset = candidate
+            break
+    if not asset:
+        raise HTTPException(status_code=404, detail=f"No asset for Vizard project {project_id}")
+
+    # Some callback shapes carry the clip list; a bare ready-ping doesn't,
+    # so fetch it once — this is the single poll the webhook replaces
+    clips_data = body.get("clips") or body.get("list") or []
+    if not clips_data:
+        clips_data = VizardAgent().get_clips(str(project_id)) or []
+    if not clips_data:
+        raise HTTPException(status_code=422, detail="Webhook fired but no clips are available yet")
+
+    executor = PipelineExecutor()
+    created = executor.record_vizard_clips(asset, clips_data, db)
+
+    # Don't regress an asset that already moved past the clip step
+    if (asset.pipeline_step or 0) <= 4:
+        asset.pipeline_step = 4
+        asset.pipeline_step_status = "COMPLETED"
+    db.commit()
+
+    logger.info(f"Vizard webhook recorded {created} clips for asset {asset.id}")
+    return {"asset_id": asset.id, "clips_created": created}
+
+
 @router.get("/{asset_id}/status", response_model=PipelineStatusResponse)
 async def get_pipeline_status(asset_id: int, db: Session = Depends(get_db)):
     """Get full pipeline status with all 5 step details."""
@@ -77,7 +250,7 @@ async def get_pipeline_status(asset_id: int, db: Session = Depends(get_db)):
         overall_status=asset.status.value if hasattr(asset.status, 'value') else str(asset.status),
         current_step=current,
         current_step_name=PIPELINE_STEP_NAMES.get(current, "Not Started"),
-        steps=_build_steps(asset),
+        steps=_build_steps(asset, db),
         error_message=asset.error_message,
     )
 
@@ -46,6 +46,9 @@ class Settings(BaseSettings):
     # Auto-Posting
     instagram_access_token: str = ""
     instagram_business_account_id: str = ""
+    # Publish Reels from the media webhook instead of in-process polling
+    # (requires /pipeline/webhooks/instagram registered with the Meta app)
+    instagram_webhook_publish: bool = False
     facebook_page_id: str = ""  # New for FB Page Posting
     facebook_access_token: str = "" # Specific Token for FB Page
     youtube_client_id: str = ""
@@ -1,9 +1,16 @@
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from src.config import settings
 
+_is_sqlite = "sqlite" in settings.get_database_url
 engine = create_engine(
-    settings.get_database_url, connect_args={"check_same_thread": False} if "sqlite" in settings.get_database_url else {}
+    settings.get_database_url,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    pool_pre_ping=True,
+    # Warm connection pool for concurrent agents (sqlite manages its own pool)
+    **({} if _is_sqlite else {"pool_size": 10, "max_overflow": 20}),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -15,3 +22,16 @@ def get_db():
         yield db
     finally:
         db.close()
+
+@contextmanager
+def session_scope():
+    """Short-lived session: commits on success, rolls back on error, always closes."""
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, JSON, Enum as SQLEnum, Text
+import json
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, JSON, Enum as SQLEnum, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from src.database import Base
@@ -35,6 +37,31 @@ class ContentAsset(Base):
     clips = relationship("Clip", back_populates="asset")
 
 
+class PipelineStepResult(Base):
+    """One pipeline step's outcome for an asset.
+
+    Step payloads used to live as keys inside ContentAsset.pipeline_data,
+    which meant rewriting the whole JSON blob — transcript included — on
+    every step. One row per (asset, step) keeps each write O(that step's
+    own data).
+    """
+    __tablename__ = "pipeline_step_results"
+    __table_args__ = (
+        # Upserts and per-step reads hit exactly one row
+        Index("ix_step_results_asset_step", "asset_id", "step", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    asset_id = Column(Integer, ForeignKey("content_assets.id"))
+    step = Column(Integer)
+
+    status = Column(String, default="PENDING")
+    result = Column(JSON, default={})  # Full step payload (status, timestamp, result...)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class Clip(Base):
     """Derived short clip cut from a ContentAsset."""
     __tablename__ = "clips"
@@ -53,7 +80,9 @@ class Clip(Base):
     error_message = Column(Text, nullable=True)
 
     # Intelligence Data
-    transcription = Column(Text, nullable=True)
+    # Per-platform captions as JSON — the driver (de)serializes once
+    # instead of every reader calling json.loads on a Text blob
+    transcription = Column(JSON, nullable=True)
     virality_score = Column(Float, default=0.0)
     hook_strength = Column(Float, default=0.0)
     emotion_tags = Column(JSON, default=[])
@@ -64,9 +93,23 @@ class Clip(Base):
     asset = relationship("ContentAsset", back_populates="clips")
     posts = relationship("Post", back_populates="clip")
 
+    def captions_dict(self) -> dict:
+        """Captions as a dict, tolerating legacy rows that stored JSON text."""
+        caps = self.transcription
+        if isinstance(caps, str):
+            try:
+                caps = json.loads(caps)
+            except ValueError:
+                return {}
+        return caps or {}
+
 
 class WhatsAppMessage(Base):
     __tablename__ = "whatsapp_messages"
+    __table_args__ = (
+        # Chat context pulls "latest N for this sender" on every message
+        Index("ix_wa_sender_ts", "sender", "timestamp"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     sender = Column(String)
     message = Column(Text)
@@ -134,6 +177,9 @@ class Event(Base):
     event_type = Column(String, default="MEETING") # MEETING, RECORDING, VIRAL_DROP
     
     status = Column(String, default="SCHEDULED") # SCHEDULED, COMPLETED, CANCELLED
-    
+
+    google_event_id = Column(String, nullable=True) # Set once background sync lands
+    sync_state = Column(String, default="PENDING") # PENDING, SYNCED, FAILED
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,30 @@
+"""
+Process-wide OpenAI client.
+
+Each agent used to build its own OpenAI() — and with it a private httpx
+connection pool — so keep-alive connections and TLS sessions were never
+shared between call sites, and every cold pool paid its own handshake.
+One client here keeps a single warm pool for all of them.
+"""
+import httpx
+from openai import OpenAI
+
+from src.config import settings
+
+_client = None
+
+
+def get_openai_client() -> OpenAI:
+    """Shared OpenAI client, built lazily on first use."""
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=settings.openai_api_key,
+            max_retries=3,
+            timeout=60.0,
+            http_client=httpx.Client(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                timeout=60.0,
+            ),
+        )
+    return _client
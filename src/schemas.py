@@ -5,7 +5,7 @@ Clean separation: Models = DB, Schemas = API interface
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union
 from pydantic import BaseModel, Field
 
 
@@ -65,7 +65,7 @@ class ClipResponse(BaseModel):
     duration: float
     status: str
     error_message: Optional[str] = None
-    transcription: Optional[str] = None
+    transcription: Optional[Union[dict, str]] = None  # dict now; str on legacy rows
     virality_score: float = 0.0
     hook_strength: float = 0.0
     emotion_tags: Optional[list] = None
@@ -44,6 +44,7 @@ celery_app.conf.update(
         "src.workers.tasks.process_asset": {"queue": "heavy"},
         "src.workers.tasks.transcribe_asset": {"queue": "heavy"},
         "src.workers.tasks.cut_clips": {"queue": "heavy"},
+        "src.workers.tasks.post_clip_task": {"queue": "heavy"},
     },
 
     # Auto-discover tasks
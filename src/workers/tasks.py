@@ -7,8 +7,8 @@ from datetime import datetime, timezone
 
 from src.workers.celery_app import celery_app
 from src.database import SessionLocal
-from src.models import ContentAsset, Clip
-from src.enums import ContentStatus, ClipStatus
+from src.models import ContentAsset, Clip, Post
+from src.enums import ContentStatus, ClipStatus, PostStatus, Platform
 from src.agents.vizard_agent import VizardAgent
 from src.agents.captioner import CaptionAgent
 
@@ -71,6 +71,65 @@ def process_vizard_pipeline(asset_id: int):
     finally:
         db.close()
 
+@celery_app.task(name="src.workers.tasks.post_clip_task", bind=True, max_retries=3)
+def post_clip_task(self, clip_id: int, platforms: list = None):
+    """
+    Decoupled posting worker: submitters enqueue a clip and return
+    immediately; completion (including Instagram's minutes-long media
+    processing) happens here, with Celery retries on failure.
+    """
+    from src.agents.auto_poster import get_auto_poster
+
+    platforms = platforms or ["INSTAGRAM", "YOUTUBE", "FACEBOOK"]
+    db = SessionLocal()
+    try:
+        clip = db.query(Clip).filter(Clip.id == clip_id).first()
+        if not clip:
+            logger.error(f"Clip {clip_id} not found in DB")
+            return
+        if not clip.file_path or not clip.file_path.startswith("http"):
+            logger.error(f"Clip {clip_id} has no public URL, cannot post")
+            return
+
+        captions = clip.captions_dict()
+        title = clip.asset.title if clip.asset else None
+
+        poster = get_auto_poster()
+        results = poster.post_clip(
+            video_url=clip.file_path,
+            platforms=platforms,
+            captions=captions,
+            title=title,
+        )
+
+        posted = 0
+        for r in results:
+            if r.get("status") == "POSTED":
+                platform_name = r.get("platform", "UNKNOWN")
+                post = Post(
+                    clip_id=clip.id,
+                    platform=Platform[platform_name] if platform_name in Platform.__members__ else Platform.LOCAL,
+                    status=PostStatus.POSTED,
+                    caption=captions.get("ig", title),
+                    post_url=r.get("post_id", "") or r.get("video_id", ""),
+                    platform_post_id=r.get("post_id", "") or r.get("video_id", ""),
+                )
+                db.add(post)
+                posted += 1
+        if posted:
+            clip.status = ClipStatus.POSTED
+        db.commit()
+
+        logger.info(f"post_clip_task done for clip {clip_id}: {posted}/{len(results)} posted")
+        return [r.get("status") for r in results]
+
+    except Exception as e:
+        logger.error(f"post_clip_task failed for clip {clip_id}: {e}")
+        raise self.retry(exc=e, countdown=60)
+    finally:
+        db.close()
+
+
 # Alias the old name to new pipeline for existing API calls
 @celery_app.task(name="src.workers.tasks.process_asset")
 def process_asset(asset_id: int):
@@ -323,12 +323,18 @@ elif nav == "🎬 Video Clips":
                             st.write(f"**Viral Score: {clip.get('virality_score', 0)*10:.1f}/10**")
                             st.write(f"Duration: {clip.get('duration', 0)}s")
                             if clip.get('transcription'):
-                                try:
-                                    caps = json.loads(clip['transcription'])
+                                # The API returns a dict now; legacy rows still come back as JSON text
+                                caps = clip['transcription']
+                                if isinstance(caps, str):
+                                    try:
+                                        caps = json.loads(caps)
+                                    except ValueError:
+                                        caps = None
+                                if isinstance(caps, dict):
                                     st.write(f"IG: {caps.get('ig', 'N/A')}")
                                     st.write(f"YT: {caps.get('yt', 'N/A')}")
-                                except:
-                                    st.write(f"Caption: {clip['transcription'][:100]}")
+                                else:
+                                    st.write(f"Caption: {str(clip['transcription'])[:100]}")
                         st.markdown("</div>", unsafe_allow_html=True)
                 else:
                     st.info("No clips generated yet.")